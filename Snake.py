@@ -1,11 +1,21 @@
+import copy
 import json
 import os
 import platform
+import queue
 import random
+import struct
+import sys
+import tempfile
+import threading
 import time
+import weakref
 import tkinter as tk
 import tkinter.messagebox as messagebox
 from tkinter import ttk, colorchooser
+from array import array
+from collections import deque
+from collections.abc import MutableMapping
 from datetime import datetime
 
 
@@ -13,6 +23,24 @@ from datetime import datetime
 FILE_PATH = os.path.dirname(__file__)
 SPEED_OPTIONS = {'Slow': 150, 'Medium': 100, 'Fast': 50}
 INITIAL_POSITION = (20, 20)
+DIRECTIONS = {'Left': (-1, 0), 'Right': (1, 0), 'Up': (0, -1), 'Down': (0, 1)}
+OPPOSITES = {'Left': 'Right', 'Right': 'Left', 'Up': 'Down', 'Down': 'Up'}
+MAX_BOARD_SIDE = 10000
+DENSE_BOARD_CELLS = 1 << 18
+CHUNK_SIZE = 32
+RENDERERS = ('items', 'raster')
+REPLAY_DIR = f'{FILE_PATH}/replays'
+REPLAY_MAGIC = b'SNKR'
+REPLAY_VERSION = 2
+REPLAY_HEADER = struct.Struct('<4sBQHHHHHH')
+REPLAY_ACTIONS = ('Left', 'Right', 'Up', 'Down')
+REPLAY_REWIND = 4
+REPLAY_END = 7
+REWIND_HISTORY = 600
+PROFILE_DIR = f'{FILE_PATH}/profiles'
+PROFILE_TOP = 10
+ARENA_SNAKES = 100
+ARENA_PLAYERS = 1
 
 # Default Themes
 default_app_theme = {
@@ -33,6 +61,8 @@ default_game_theme = {
     'snake_size': 20,
     'canvas_width': 800,
     'canvas_height': 800,
+    'board_columns': 0,
+    'board_rows': 0,
     'title_color': '#FF0000',
     'logo_color': '#FFFFFF',
     'snake_color': '#00FF00',
@@ -40,6 +70,86 @@ default_game_theme = {
     'gameover_color': '#FFFFFF'
 }
 
+def file_mode(path):
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def write_json_atomic(path, data):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        os.chmod(temp_path, file_mode(path))
+        with os.fdopen(fd, 'w') as file:
+            json.dump(data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+class Persister:
+    def __init__(self, delay=0.25):
+        self.delay = delay
+        self.pending = {}
+        self.due = None
+        self.busy = False
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name='persister', daemon=True)
+        self.thread.start()
+
+    def submit(self, task, key=None):
+        with self.condition:
+            if self.closed:
+                raise RuntimeError('Persister is closed')
+            self.pending[object() if key is None else key] = task
+            if self.due is None:
+                self.due = time.monotonic() + self.delay
+            self.condition.notify_all()
+
+    def save_json(self, path, data):
+        snapshot = copy.deepcopy(data)
+        self.submit(lambda: write_json_atomic(path, snapshot), key=path)
+
+    def idle(self):
+        with self.condition:
+            return not self.pending and not self.busy
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                while self.pending and not self.closed and self.due - time.monotonic() > 0:
+                    self.condition.wait(self.due - time.monotonic())
+                if not self.pending:
+                    return
+                tasks = list(self.pending.values())
+                self.pending.clear()
+                self.due = None
+                self.busy = True
+            for task in tasks:
+                try:
+                    task()
+                except Exception as error:
+                    print(f'Could not save: {error!r}', file=sys.stderr)
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+
+    def close(self, timeout=5):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+
 # Load themes
 def load_themes(file_name, default_theme):
     try:
@@ -47,82 +157,162 @@ def load_themes(file_name, default_theme):
             themes = json.load(file)
     except FileNotFoundError:
         themes = {"Default Theme": default_theme}
-        with open(f'{FILE_PATH}/{file_name}', 'w') as file:
-            json.dump(themes, file, indent=4)
+        write_json_atomic(f'{FILE_PATH}/{file_name}', themes)
     return themes
 
-app_themes = load_themes("app_themes.json", default_app_theme)
-game_themes = load_themes("game_themes.json", default_game_theme)
+class ThemeCollection(MutableMapping):
+    def __init__(self, file_name, default_theme):
+        self.file_name = file_name
+        self.default_theme = default_theme
+        self.themes = None
+
+    def load(self):
+        if self.themes is None:
+            self.themes = load_themes(self.file_name, self.default_theme)
+        return self.themes
+
+    def __getitem__(self, name):
+        return self.load()[name]
+
+    def __setitem__(self, name, theme):
+        self.load()[name] = theme
+
+    def __delitem__(self, name):
+        del self.load()[name]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+class GameTheme:
+    __slots__ = ('snake_size', 'canvas_width', 'canvas_height', 'columns', 'rows', 'view_columns', 'view_rows', 'start',
+                 'title_color', 'logo_color', 'snake_color', 'food_color', 'gameover_color')
+
+    def __init__(self, theme):
+        for key in ('snake_size', 'canvas_width', 'canvas_height'):
+            try:
+                value = int(theme[key])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f'{key} must be a whole number, got {theme.get(key)!r}')
+            if value <= 0:
+                raise ValueError(f'{key} must be greater than zero, got {value}')
+            object.__setattr__(self, key, value)
+        if self.snake_size > min(self.canvas_width, self.canvas_height):
+            raise ValueError('snake_size must fit inside the canvas')
+        object.__setattr__(self, 'view_columns', self.canvas_width // self.snake_size)
+        object.__setattr__(self, 'view_rows', self.canvas_height // self.snake_size)
+        for key, view in (('board_columns', self.view_columns), ('board_rows', self.view_rows)):
+            try:
+                value = int(theme.get(key) or 0)
+            except (TypeError, ValueError):
+                raise ValueError(f'{key} must be a whole number, got {theme.get(key)!r}')
+            if value and not view <= value <= MAX_BOARD_SIDE:
+                raise ValueError(f'{key} must be 0 (fit the canvas) or between {view} and {MAX_BOARD_SIDE}, got {value}')
+            object.__setattr__(self, key[6:], value or view)
+        object.__setattr__(self, 'start', (min(INITIAL_POSITION[0] // self.snake_size, self.columns - 1),
+                                           min(INITIAL_POSITION[1] // self.snake_size, self.rows - 1)))
+        for key in ('title_color', 'logo_color', 'snake_color', 'food_color', 'gameover_color'):
+            object.__setattr__(self, key, theme.get(key, default_game_theme[key]))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('GameTheme is immutable; compile a new one instead')
+
+app_themes = ThemeCollection("app_themes.json", default_app_theme)
+game_themes = ThemeCollection("game_themes.json", default_game_theme)
+
+class ThemeRegistry:
+    def __init__(self):
+        self.widgets = {}
+        self.last_apply = (0, 0.0)
+
+    def register(self, widget):
+        self.widgets.setdefault(widget.theme_options, weakref.WeakSet()).add(widget)
+
+    def configure_styles(self, app_theme):
+        style = ttk.Style()
+        colors = dict(background=app_theme['background_color'],
+                      foreground=app_theme['foreground_color'],
+                      activebackground=app_theme['active_background'],
+                      activeforeground=app_theme['active_foreground'],
+                      disabledbackground=app_theme['disabled_background'],
+                      disabledforeground=app_theme['disabled_foreground'])
+        style.configure('Custom.TNotebook', **colors)
+        style.configure('Custom.TNotebook.Tab', **colors)
+        style.map('Custom.TNotebook.Tab', background=[('selected', app_theme.get('active_background'))])
+        style.configure('Custom.Treeview', fieldbackground=app_theme.get('background_color'), **colors)
+        style.configure('Custom.Treeview.Heading', **colors)
+        style.map('Custom.Treeview.Heading', background=[('active', app_theme.get('active_background'))])
+        return style
+
+    def apply(self, app_theme):
+        start = time.perf_counter()
+        self.configure_styles(app_theme)
+        count = 0
+        for theme_options, widgets in self.widgets.items():
+            options = theme_options(app_theme)
+            for widget in list(widgets):
+                try:
+                    widget.apply_app_theme(options)
+                except tk.TclError:
+                    widgets.discard(widget)
+                else:
+                    count += 1
+        self.last_apply = (count, time.perf_counter() - start)
+        return self.last_apply
+
+theme_registry = ThemeRegistry()
+
+class ThemedWidget:
+    @staticmethod
+    def theme_options(app_theme):
+        return {'background': app_theme['background_color']}
+
+    def register_theme(self, app_theme):
+        self.apply_app_theme(self.theme_options(app_theme))
+        theme_registry.register(self)
+
+    def apply_app_theme(self, options):
+        self.configure(**options)
 
 class CustomNotebook(ttk.Notebook):
     def __init__(self, *args, **kwargs):
         app_theme = kwargs.pop('app_theme', {})
         super().__init__(*args, **kwargs)
-        self.style = ttk.Style()
-        self.style.configure('Custom.TNotebook',
-                             background=app_theme['background_color'],
-                             foreground=app_theme['foreground_color'],
-                             activebackground=app_theme['active_background'],
-                             activeforeground=app_theme['active_foreground'],
-                             disabledbackground=app_theme['disabled_background'],
-                             disabledforeground=app_theme['disabled_foreground']
-                             )
-        self.style.configure('Custom.TNotebook.Tab',
-                             background=app_theme['background_color'],
-                             foreground=app_theme['foreground_color'],
-                             activebackground=app_theme['active_background'],
-                             activeforeground=app_theme['active_foreground'],
-                             disabledbackground=app_theme['disabled_background'],
-                             disabledforeground=app_theme['disabled_foreground']
-                             )
-        self.style.map('Custom.TNotebook.Tab', background=[('selected', app_theme.get('active_background'))])
+        self.style = theme_registry.configure_styles(app_theme)
         self.configure(style='Custom.TNotebook')
 
 class CustomTreeview(ttk.Treeview):
     def __init__(self, *args, **kwargs):
         app_theme = kwargs.pop('app_theme', {})
         super().__init__(*args, **kwargs)
-        self.style = ttk.Style()
-        self.style.configure('Custom.Treeview',
-                             background=app_theme['background_color'],
-                             foreground=app_theme['foreground_color'],
-                             activebackground=app_theme['active_background'],
-                             activeforeground=app_theme['active_foreground'],
-                             disabledbackground=app_theme['disabled_background'],
-                             disabledforeground=app_theme['disabled_foreground'],
-                             fieldbackground=app_theme.get('background_color')
-                             )
-        self.style.configure('Custom.Treeview.Heading',
-                             background=app_theme['background_color'],
-                             foreground=app_theme['foreground_color'],
-                             activebackground=app_theme['active_background'],
-                             activeforeground=app_theme['active_foreground'],
-                             disabledbackground=app_theme['disabled_background'],
-                             disabledforeground=app_theme['disabled_foreground']
-                             )
-        self.style.map('Custom.Treeview.Heading', background=[('active', app_theme.get('active_background'))])
+        self.style = theme_registry.configure_styles(app_theme)
         self.configure(style='Custom.Treeview')
 
-class CustomOptionMenu(tk.OptionMenu):
+class CustomOptionMenu(ThemedWidget, tk.OptionMenu):
+    MENU_OPTIONS = ('background', 'foreground', 'activebackground', 'activeforeground')
+
     def __init__(self, master, variable, *values, app_theme=None, **kwargs):
         super().__init__(master, variable, *values, **kwargs)
-        self.config(
+        self.config(highlightthickness=1, bd=1)
+        self.register_theme(app_theme)
+
+    @staticmethod
+    def theme_options(app_theme):
+        return dict(
             background=app_theme['background_color'],
             foreground=app_theme['foreground_color'],
             activebackground=app_theme['active_background'],
             activeforeground=app_theme['active_foreground'],
             highlightbackground=app_theme['foreground_color'],
-            highlightcolor=app_theme['foreground_color'],
-            highlightthickness=1,
-            bd=1
-        )
-        self['menu'].config(
-            background=app_theme['background_color'],
-            foreground=app_theme['foreground_color'],
-            activebackground=app_theme['active_background'],
-            activeforeground=app_theme['active_foreground']
+            highlightcolor=app_theme['foreground_color']
         )
 
+    def apply_app_theme(self, options):
+        self.configure(**options)
+        self['menu'].configure(**{key: options[key] for key in self.MENU_OPTIONS})
+
     def set_menu(self, value, *values):
         menu = self['menu']
         menu.delete(0, 'end')
@@ -130,10 +320,14 @@ class CustomOptionMenu(tk.OptionMenu):
             menu.add_command(label=val, command=tk._setit(self.variable, val))
         self.variable.set(value)
 
-class CustomEntry(tk.Entry):
+class CustomEntry(ThemedWidget, tk.Entry):
     def __init__(self, master=None, app_theme=None, **kwargs):
         super().__init__(master, **kwargs)
-        self.config(
+        self.register_theme(app_theme)
+
+    @staticmethod
+    def theme_options(app_theme):
+        return dict(
             background=app_theme['background_color'],
             foreground=app_theme['foreground_color'],
             disabledbackground=app_theme['disabled_background'],
@@ -142,30 +336,31 @@ class CustomEntry(tk.Entry):
             insertbackground=app_theme['foreground_color']
         )
 
-class CustomLabel(tk.Label):
+class CustomLabel(ThemedWidget, tk.Label):
     def __init__(self, master=None, app_theme=None, **kwargs):
         super().__init__(master, **kwargs)
-        self.config(
+        self.register_theme(app_theme)
+
+    @staticmethod
+    def theme_options(app_theme):
+        return dict(
             background=app_theme['background_color'],
             foreground=app_theme['foreground_color'],
             activebackground=app_theme['active_background'],
             activeforeground=app_theme['active_foreground'],
         )
 
-class CustomButton(tk.Button):
+class CustomButton(ThemedWidget, tk.Button):
     def __init__(self, master=None, app_theme=None, **kwargs):
         super().__init__(master, **kwargs)
-        self.config(
-            background=app_theme['background_color'],
-            foreground=app_theme['foreground_color'],
-            activebackground=app_theme['active_background'],
-            activeforeground=app_theme['active_foreground'],
-        )
+        self.register_theme(app_theme)
 
-class CustomFrame(tk.Frame):
+    theme_options = staticmethod(CustomLabel.theme_options)
+
+class CustomFrame(ThemedWidget, tk.Frame):
     def __init__(self, master=None, app_theme=None, **kwargs):
         super().__init__(master, **kwargs)
-        self.config(background=app_theme['background_color'])
+        self.register_theme(app_theme)
 
 class CustomColorChooser(tk.Toplevel):
     def __init__(self, master=None, app_theme=None, on_color_chosen=None, title="", initial_color="#000000"):
@@ -330,12 +525,13 @@ class CustomMessageBox(tk.Toplevel):
         y = event.y_root - self.y
         self.geometry(f'+{x}+{y}')
 
-class CustomToplevel(tk.Toplevel):
+class CustomToplevel(ThemedWidget, tk.Toplevel):
     def __init__(self, master, *args, **kwargs):
         self.master = master
         app_theme = kwargs.pop('app_theme', {})
         title = kwargs.pop('title', 'Window')
         super().__init__(master, *args, **kwargs)
+        self.register_theme(app_theme)
         self.withdraw()
         self.overrideredirect(True)
         self.frame = CustomFrame(self, app_theme=app_theme, bd=1, relief='solid',
@@ -395,40 +591,1443 @@ class CustomToplevel(tk.Toplevel):
         y = event.y_root - self.y
         self.geometry(f'+{x}+{y}')
 
-    def set_status(self, message):
+    def set_status(self, message, timeout=5000):
         self.status_label.config(text=message)
-        self.after(5000, lambda: self.status_label.config(text=''))
+        if timeout:
+            self.after(timeout, lambda: self.status_label.config(text=''))
 
     def set_title(self, title):
         self.title_label.config(text=title)
 
+class FreeCells:
+    def __init__(self, cells=()):
+        self.cells = list(cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def add(self, cell):
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        i = self.index.pop(cell, None)
+        if i is None:
+            return None
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+        return i
+
+    def restore(self, cell, i):
+        if i < len(self.cells):
+            moved = self.cells[i]
+            self.index[moved] = len(self.cells)
+            self.cells.append(moved)
+            self.cells[i] = cell
+        else:
+            self.cells.append(cell)
+        self.index[cell] = i
+
+    def remove_last(self, cell):
+        self.cells.pop()
+        del self.index[cell]
+
+    def choice(self, rng=random):
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+class SnakeBody:
+    def __init__(self, cells=(), free_cells=None):
+        self.cells = deque()
+        self.occupied = {}
+        self.free_cells = free_cells
+        for cell in cells:
+            self.append_tail(cell)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __getitem__(self, index):
+        return self.cells[index]
+
+    def __contains__(self, cell):
+        return cell in self.occupied
+
+    @property
+    def head(self):
+        return self.cells[0]
+
+    @property
+    def tail(self):
+        return self.cells[-1]
+
+    def push_head(self, cell):
+        self.cells.appendleft(cell)
+        return self.occupy(cell)
+
+    def pop_head(self, slot=None):
+        cell = self.cells.popleft()
+        count = self.occupied[cell] - 1
+        if count:
+            self.occupied[cell] = count
+        else:
+            del self.occupied[cell]
+            if self.free_cells is not None:
+                self.free_cells.restore(cell, slot)
+        return cell
+
+    def restore_tail(self, cell):
+        self.cells.append(cell)
+        count = self.occupied.get(cell, 0)
+        self.occupied[cell] = count + 1
+        if not count and self.free_cells is not None:
+            self.free_cells.remove_last(cell)
+
+    def append_tail(self, cell):
+        self.cells.append(cell)
+        self.occupy(cell)
+
+    def pop_tail(self):
+        cell = self.cells.pop()
+        count = self.occupied[cell] - 1
+        if count:
+            self.occupied[cell] = count
+        else:
+            del self.occupied[cell]
+            if self.free_cells is not None:
+                self.free_cells.add(cell)
+        return cell
+
+    def occupy(self, cell):
+        count = self.occupied.get(cell, 0)
+        self.occupied[cell] = count + 1
+        if not count and self.free_cells is not None:
+            return self.free_cells.discard(cell)
+        return None
+
+    def head_collides(self):
+        return self.occupied.get(self.cells[0], 0) > 1
+
+    @property
+    def occupied_count(self):
+        return len(self.occupied)
+
+class PackedSnakeBody:
+    def __init__(self, columns, rows, cells=(), free_cells=None, capacity=16):
+        self.columns = columns
+        self.buffer = array('I', bytes(4 * capacity))
+        self.head_index = 0
+        self.length = 0
+        self.bitmap = bytearray((columns * rows + 7) // 8)
+        self.overlaps = {}
+        self.free_cells = free_cells
+        for cell in cells:
+            self.append_tail(cell)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        buffer, capacity, columns = self.buffer, len(self.buffer), self.columns
+        for i in range(self.length):
+            y, x = divmod(buffer[(self.head_index - i) % capacity], columns)
+            yield x, y
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError('snake index out of range')
+        y, x = divmod(self.buffer[(self.head_index - index) % len(self.buffer)], self.columns)
+        return x, y
+
+    def __contains__(self, cell):
+        x, y = cell
+        if not 0 <= x < self.columns:
+            return False
+        packed = y * self.columns + x
+        return 0 <= packed < len(self.bitmap) * 8 and bool(self.bitmap[packed >> 3] & (1 << (packed & 7)))
+
+    @property
+    def head(self):
+        return self[0]
+
+    @property
+    def tail(self):
+        return self[-1]
+
+    @property
+    def occupied_count(self):
+        return self.length - sum(self.overlaps.values())
+
+    def grow(self):
+        capacity = len(self.buffer)
+        tail_index = (self.head_index - self.length + 1) % capacity
+        ordered = self.buffer[tail_index:] + self.buffer[:tail_index] if self.length else array('I')
+        self.buffer = ordered + array('I', bytes(4 * capacity))
+        self.head_index = self.length - 1
+
+    def push_head(self, cell):
+        if self.length == len(self.buffer):
+            self.grow()
+        packed = cell[1] * self.columns + cell[0]
+        self.head_index = (self.head_index + 1) % len(self.buffer)
+        self.buffer[self.head_index] = packed
+        self.length += 1
+        return self.occupy(packed, cell)
+
+    def append_tail(self, cell):
+        if self.length == len(self.buffer):
+            self.grow()
+        packed = cell[1] * self.columns + cell[0]
+        if self.length:
+            self.buffer[(self.head_index - self.length) % len(self.buffer)] = packed
+        else:
+            self.buffer[self.head_index] = packed
+        self.length += 1
+        self.occupy(packed, cell)
+
+    def pop_head(self, slot=None):
+        packed = self.buffer[self.head_index]
+        self.head_index = (self.head_index - 1) % len(self.buffer)
+        self.length -= 1
+        return self.release(packed, slot)
+
+    def pop_tail(self):
+        packed = self.buffer[(self.head_index - self.length + 1) % len(self.buffer)]
+        self.length -= 1
+        return self.release(packed)
+
+    def restore_tail(self, cell):
+        self.append_tail(cell)
+
+    def occupy(self, packed, cell):
+        byte, bit = packed >> 3, 1 << (packed & 7)
+        if self.bitmap[byte] & bit:
+            self.overlaps[packed] = self.overlaps.get(packed, 0) + 1
+            return None
+        self.bitmap[byte] |= bit
+        if self.free_cells is not None:
+            return self.free_cells.discard(cell)
+        return None
+
+    def release(self, packed, slot=None):
+        y, x = divmod(packed, self.columns)
+        cell = (x, y)
+        extra = self.overlaps.get(packed)
+        if extra:
+            if extra > 1:
+                self.overlaps[packed] = extra - 1
+            else:
+                del self.overlaps[packed]
+            return cell
+        self.bitmap[packed >> 3] &= ~(1 << (packed & 7)) & 0xFF
+        if self.free_cells is not None:
+            if slot is None:
+                self.free_cells.add(cell)
+            else:
+                self.free_cells.restore(cell, slot)
+        return cell
+
+    def head_collides(self):
+        return self.buffer[self.head_index] in self.overlaps
+
+def encode_varint(value, out):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+class ReplayRecorder:
+    def __init__(self, path, seed, interval_ms, columns, rows, snake_size, start, flush_bytes=4096):
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.buffer = bytearray(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, seed, interval_ms, columns, rows, snake_size, *start))
+        self.last_tick = 0
+        self.closed = False
+        self.chunks = queue.SimpleQueue()
+        self.writer = threading.Thread(target=self.write_chunks, name='replay-writer', daemon=True)
+        self.writer.start()
+
+    def record(self, tick, action):
+        encode_varint((tick - self.last_tick) << 3 | REPLAY_ACTIONS.index(action), self.buffer)
+        self.last_tick = tick
+        if len(self.buffer) >= self.flush_bytes:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.chunks.put(bytes(self.buffer))
+            self.buffer.clear()
+
+    def rewind(self, tick, ticks):
+        encode_varint((tick - self.last_tick) << 3 | REPLAY_REWIND, self.buffer)
+        encode_varint(ticks, self.buffer)
+        self.last_tick = tick - ticks
+
+    def close(self, ticks, length):
+        if self.closed:
+            return
+        self.closed = True
+        encode_varint((ticks - self.last_tick) << 3 | REPLAY_END, self.buffer)
+        encode_varint(length, self.buffer)
+        self.flush()
+        self.chunks.put(None)
+
+    def wait(self, timeout=None):
+        self.writer.join(timeout)
+
+    def write_chunks(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'wb', buffering=1 << 16) as file:
+            while True:
+                chunk = self.chunks.get()
+                if chunk is None:
+                    break
+                file.write(chunk)
+
+def decode_varints(data, offset=0):
+    value = shift = 0
+    for byte in data[offset:]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+
+def replay_duration(ticks, interval_ms):
+    return ticks * interval_ms // 1000
+
+class Replay:
+    def __init__(self, seed, interval_ms, columns, rows, snake_size, start, events, ticks=None, length=None):
+        self.seed = seed
+        self.interval_ms = interval_ms
+        self.columns = columns
+        self.rows = rows
+        self.snake_size = snake_size
+        self.start = start
+        self.events = events
+        self.ticks = ticks
+        self.length = length
+
+    @property
+    def complete(self):
+        return self.ticks is not None
+
+    def create_engine(self):
+        history = REWIND_HISTORY if any(isinstance(action, int) for _, action in self.events) else 0
+        return Engine(self.columns, self.rows, start=self.start, rng=random.Random(self.seed), history=history)
+
+def load_replay(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < REPLAY_HEADER.size:
+        raise ValueError(f'{path} is not a replay file')
+    magic, version, seed, interval_ms, columns, rows, snake_size, start_x, start_y = REPLAY_HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC:
+        raise ValueError(f'{path} is not a replay file')
+    if not 1 <= version <= REPLAY_VERSION:
+        raise ValueError(f'{path} is a version {version} replay; this version of Snake reads up to version {REPLAY_VERSION}')
+
+    events = []
+    tick = 0
+    ticks = length = None
+    values = decode_varints(data, REPLAY_HEADER.size)
+    for value in values:
+        tick += value >> 3
+        opcode = value & 0x7
+        if opcode == REPLAY_END:
+            ticks = tick
+            length = next(values, None)
+            break
+        if opcode == REPLAY_REWIND:
+            rewound = next(values, 0)
+            events.append((tick, rewound))
+            tick -= rewound
+            continue
+        events.append((tick, REPLAY_ACTIONS[opcode]))
+    return Replay(seed, interval_ms, columns, rows, snake_size, (start_x, start_y), events, ticks, length)
+
+class ReplayCursor:
+    def __init__(self, events):
+        self.events = events
+        self.index = 0
+
+    @property
+    def finished(self):
+        return self.index >= len(self.events)
+
+    def action_for(self, tick):
+        if self.index < len(self.events) and self.events[self.index][0] == tick:
+            self.index += 1
+            return self.events[self.index - 1][1]
+        return None
+
+def simulate_replay(replay):
+    engine = replay.create_engine()
+    state = engine.state
+    step = engine.step
+    end = replay.ticks
+    for tick, action in replay.events:
+        while state.alive and state.ticks < tick:
+            step()
+        if isinstance(action, int):
+            engine.rewind(action)
+        elif not state.alive:
+            break
+        else:
+            step(action)
+    while state.alive and (end is None or state.ticks < end):
+        step()
+    return state
+
+def verify_replay(path, length, duration, interval_ms):
+    try:
+        replay = load_replay(path)
+    except (OSError, ValueError) as error:
+        return 'missing', str(error)
+    state = simulate_replay(replay)
+    simulated = (len(state.snake), replay_duration(state.ticks, replay.interval_ms), replay.interval_ms)
+    if simulated != (length, duration, interval_ms):
+        return 'mismatch', f'replay gives length {simulated[0]}, {simulated[1]}s at {simulated[2]} ms'
+    return 'ok', ''
+
+def verify_scores(rows, workers=None):
+    from concurrent.futures import ProcessPoolExecutor
+
+    rows = list(rows)
+    checked = [row for row in rows if row[6]]
+    jobs = [(f'{REPLAY_DIR}/{row[6]}', row[3], row[4], SPEED_OPTIONS[row[1]]) for row in checked]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        outcomes = executor.map(verify_replay, *zip(*jobs), chunksize=64) if jobs else []
+        results = dict(zip((row[0] for row in checked), outcomes))
+    return [(row, results.get(row[0], ('unrecorded', 'no replay for this score'))) for row in rows]
+
+class ScoreStore:
+    COLUMNS = 'id, difficulty, name, score, duration, timestamp, replay'
+
+    def __init__(self, path):
+        import sqlite3
+
+        self.path = path
+        self.lock = threading.RLock()
+        self.pending = []
+        self.next_pending_id = -1
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        with self.connection:
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS games (
+                    id INTEGER PRIMARY KEY,
+                    difficulty TEXT NOT NULL,
+                    name TEXT NOT NULL DEFAULT '',
+                    score INTEGER NOT NULL,
+                    duration INTEGER NOT NULL,
+                    timestamp REAL NOT NULL,
+                    replay TEXT NOT NULL DEFAULT ''
+                )''')
+            self.connection.execute("CREATE INDEX IF NOT EXISTS games_top ON games (difficulty, score DESC, id) WHERE name != ''")
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def stage(self, difficulty, name, score, duration, timestamp, replay=''):
+        with self.lock:
+            row = (self.next_pending_id, difficulty, name, score, duration, timestamp, replay)
+            self.next_pending_id -= 1
+            self.pending.append(row)
+        return row
+
+    def unstage(self, ids):
+        with self.lock:
+            self.pending = [row for row in self.pending if row[0] not in ids]
+
+    def record(self, difficulty, name, score, duration, timestamp, replay='', staged=None):
+        with self.lock, self.connection:
+            if staged is not None:
+                if staged not in self.pending:
+                    return None
+                self.pending.remove(staged)
+            cursor = self.connection.execute(
+                'INSERT INTO games (difficulty, name, score, duration, timestamp, replay) VALUES (?, ?, ?, ?, ?, ?)',
+                (difficulty, name, score, duration, timestamp, replay))
+        return cursor.lastrowid
+
+    def top(self, difficulty, limit=10):
+        return self.page(difficulty, 0, limit)
+
+    def page(self, difficulty, offset, limit):
+        query = f"SELECT {self.COLUMNS} FROM games WHERE difficulty = ? AND name != '' ORDER BY score DESC, id LIMIT ? OFFSET ?"
+        with self.lock:
+            pending = [row for row in self.pending if row[1] == difficulty and row[2]]
+            if not pending:
+                return self.connection.execute(query, (difficulty, limit, offset)).fetchall()
+            rows = self.connection.execute(query, (difficulty, offset + limit, 0)).fetchall()
+        rows.extend(pending)
+        rows.sort(key=lambda row: (-row[3], row[0] < 0, abs(row[0])))
+        return rows[offset:offset + limit]
+
+    def count(self, difficulty):
+        with self.lock:
+            pending = sum(1 for row in self.pending if row[1] == difficulty and row[2])
+            return pending + self.connection.execute("SELECT COUNT(*) FROM games WHERE difficulty = ? AND name != ''", (difficulty,)).fetchone()[0]
+
+    def qualifies(self, difficulty, score, limit=10):
+        top = self.top(difficulty, limit)
+        return len(top) < limit or score > top[-1][3]
+
+    def delete(self, ids):
+        with self.lock, self.connection:
+            self.connection.executemany('DELETE FROM games WHERE id = ?', ((game_id,) for game_id in ids))
+
+    def rows(self):
+        with self.lock:
+            return self.connection.execute(f'SELECT {self.COLUMNS} FROM games ORDER BY id').fetchall()
+
+    def import_json(self, path):
+        with self.lock:
+            if self.connection.execute('PRAGMA user_version').fetchone()[0]:
+                return
+            self.import_scores(path)
+
+    def import_scores(self, path):
+        try:
+            with open(path, 'r') as file:
+                high_scores = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            high_scores = {}
+        with self.connection:
+            for difficulty, scores in high_scores.items():
+                for entry in scores:
+                    try:
+                        timestamp = float(entry[3])
+                    except ValueError:
+                        try:
+                            timestamp = datetime.strptime(entry[3], '%A, %B %d, %Y at %I:%M%p').timestamp()
+                        except ValueError:
+                            timestamp = 0.0
+                    self.connection.execute(
+                        'INSERT INTO games (difficulty, name, score, duration, timestamp, replay) VALUES (?, ?, ?, ?, ?, ?)',
+                        (difficulty, entry[0], entry[1], entry[2], timestamp, entry[4] if len(entry) > 4 else ''))
+            self.connection.execute('PRAGMA user_version = 1')
+
+class GameState:
+    def __init__(self, columns, rows, start, direction='Right'):
+        self.columns = columns
+        self.rows = rows
+        if columns * rows <= DENSE_BOARD_CELLS:
+            self.free_cells = FreeCells((x, y) for y in range(rows) for x in range(columns))
+            self.snake = SnakeBody([start], free_cells=self.free_cells)
+        else:
+            self.free_cells = None
+            self.snake = PackedSnakeBody(columns, rows, [start])
+        self.food = None
+        self.direction = direction
+        self.ticks = 0
+        self.alive = True
+        self.won = False
+
+class Engine:
+    def __init__(self, columns, rows, start=(1, 1), rng=None, history=0):
+        self.columns = columns
+        self.rows = rows
+        self.start = start
+        self.rng = rng if rng is not None else random.Random()
+        self.history = deque(maxlen=history) if history else None
+        self.reset()
+
+    def reset(self):
+        if self.history is not None:
+            self.history.clear()
+        self.state = GameState(self.columns, self.rows, self.start)
+        self.state.food = self.create_food()
+        return self.state
+
+    def save_rng(self):
+        version, internal, gauss = self.rng.getstate()
+        return version, array('I', internal).tobytes(), gauss
+
+    def restore_rng(self, saved):
+        version, internal, gauss = saved
+        self.rng.setstate((version, tuple(array('I', internal)), gauss))
+
+    def rewind(self, ticks):
+        state = self.state
+        snake = state.snake
+        history = self.history
+        if history is None:
+            return 0
+        count = min(ticks, len(history))
+        for _ in range(count):
+            direction, head, slot, tail, food, rng = history.pop()
+            if head is not None:
+                snake.pop_head(slot)
+                if tail is not None:
+                    snake.restore_tail(tail)
+            if rng is not None:
+                self.restore_rng(rng)
+            state.food = food
+            state.direction = direction
+            state.ticks -= 1
+            state.alive = True
+            state.won = False
+        return count
+
+    def create_food(self):
+        state = self.state
+        if state.free_cells is not None:
+            return state.free_cells.choice(self.rng)
+        if state.snake.occupied_count >= self.columns * self.rows:
+            return None
+        randrange = self.rng.randrange
+        while True:
+            cell = (randrange(self.columns), randrange(self.rows))
+            if cell not in state.snake:
+                return cell
+
+    def step(self, action=None):
+        state = self.state
+        if not state.alive:
+            return False
+        previous_direction = state.direction
+        if action is not None and action != OPPOSITES[state.direction]:
+            state.direction = action
+
+        dx, dy = DIRECTIONS[state.direction]
+        x, y = state.snake.head
+        x += dx
+        y += dy
+        state.ticks += 1
+        food = state.food
+        if x < 0 or x >= self.columns or y < 0 or y >= self.rows:
+            state.alive = False
+            if self.history is not None:
+                self.history.append((previous_direction, None, None, None, food, None))
+            return False
+
+        head = (x, y)
+        snake = state.snake
+        ate = head == food
+        tail = None if ate else snake.pop_tail()
+        slot = snake.push_head(head)
+        history = self.history
+        rng = None
+        if snake.head_collides():
+            state.alive = False
+        elif ate:
+            if history is not None:
+                rng = self.save_rng()
+            state.food = self.create_food()
+            if state.food is None:
+                state.won = True
+                state.alive = False
+        if history is not None:
+            history.append((previous_direction, head, slot, tail, food, rng))
+        return ate
+
+class FixedTimestepScheduler:
+    def __init__(self, master, interval_ms, tick, max_catch_up=5):
+        self.master = master
+        self.interval = interval_ms / 1000
+        self.tick = tick
+        self.max_catch_up = max_catch_up
+        self.after_id = None
+        self.active = False
+        self.ticks = 0
+        self.skipped_ticks = 0
+
+    def start(self):
+        self.stop()
+        self.active = True
+        self.ticks = 0
+        self.skipped_ticks = 0
+        self.started = time.perf_counter()
+        self.last_time = self.started
+        self.accumulator = self.interval
+        self.run()
+
+    def stop(self):
+        self.active = False
+        if self.after_id:
+            self.master.after_cancel(self.after_id)
+            self.after_id = None
+
+    def run(self):
+        self.after_id = None
+        now = time.perf_counter()
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        due = int(self.accumulator // self.interval)
+        if due > self.max_catch_up:
+            self.skipped_ticks += due - self.max_catch_up
+            self.accumulator -= (due - self.max_catch_up) * self.interval
+            due = self.max_catch_up
+        for _ in range(due):
+            self.accumulator -= self.interval
+            self.ticks += 1
+            self.tick()
+            if not self.active:
+                return
+
+        delay = (self.interval - self.accumulator) - (time.perf_counter() - now)
+        self.after_id = self.master.after(max(0, round(delay * 1000)), self.run)
+
+    def tick_rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.ticks / elapsed if elapsed else 0.0
+
+class InputQueue:
+    def __init__(self, maxlen=3):
+        self.maxlen = maxlen
+        self.entries = deque()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+
+    def push(self, direction, current_direction, timestamp=None):
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        if len(self.entries) < self.maxlen:
+            previous = self.entries[-1][0] if self.entries else current_direction
+            if direction == previous or direction == OPPOSITES[previous]:
+                return False
+            self.entries.append((direction, timestamp))
+            return True
+
+        before_last = self.entries[-2][0] if self.maxlen > 1 else current_direction
+        if direction == before_last or direction == OPPOSITES[before_last]:
+            return False
+        self.entries[-1] = (direction, timestamp)
+        return True
+
+    def pop(self):
+        return self.entries.popleft() if self.entries else (None, None)
+
+    def restamp(self, timestamp=None):
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        self.entries = deque((direction, timestamp) for direction, _ in self.entries)
+
+def greedy_move(head, direction, target, is_free):
+    x, y = head
+    best, best_distance = None, None
+    for move, (dx, dy) in DIRECTIONS.items():
+        if move == OPPOSITES[direction]:
+            continue
+        cell = (x + dx, y + dy)
+        if not is_free(cell):
+            continue
+        distance = 0 if target is None else abs(cell[0] - target[0]) + abs(cell[1] - target[1])
+        if best is None or distance < best_distance:
+            best, best_distance = move, distance
+    return best
+
+class PlannerTimeout(Exception):
+    pass
+
+class PathPlanner:
+    CHECK_EVERY = 256
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.path = deque()
+        self.food = None
+        self.searches = 0
+        self.reused = 0
+        self.timeouts = 0
+
+    def neighbors(self, cell):
+        x, y = cell
+        for direction, (dx, dy) in DIRECTIONS.items():
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.columns and 0 <= ny < self.rows:
+                yield direction, (nx, ny)
+
+    def search(self, start, goal, release, deadline, blocked=None):
+        parents = {start: None}
+        frontier = deque([(start, 0)])
+        expanded = 0
+        while frontier:
+            cell, steps = frontier.popleft()
+            expanded += 1
+            if expanded % self.CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                raise PlannerTimeout
+            for _, neighbor in self.neighbors(cell):
+                if neighbor in parents or neighbor == blocked or release.get(neighbor, 0) > steps + 1:
+                    continue
+                parents[neighbor] = cell
+                if neighbor == goal:
+                    path = deque()
+                    while neighbor != start:
+                        path.appendleft(neighbor)
+                        neighbor = parents[neighbor]
+                    return path
+                frontier.append((neighbor, steps + 1))
+        return None
+
+    def release_times(self, snake):
+        length = len(snake)
+        return {cell: length - i for i, cell in enumerate(snake)}
+
+    def is_safe(self, snake, path, deadline):
+        if len(snake) < 3:
+            return True
+        virtual = (list(reversed(path)) + list(snake))[:len(snake) + 1]
+        return self.search(virtual[0], virtual[-1], self.release_times(virtual), deadline, blocked=virtual[1]) is not None
+
+    def wander(self, snake, food, deadline):
+        best, best_distance = None, -1
+        for direction, cell in self.neighbors(snake[0]):
+            if cell == food or (len(snake) > 1 and cell == snake[1]):
+                continue
+            virtual = [cell] + list(snake)[:-1]
+            if cell in virtual[1:]:
+                continue
+            if len(virtual) > 2 and self.search(cell, virtual[-1], self.release_times(virtual), deadline, blocked=virtual[1]) is None:
+                continue
+            distance = 0 if food is None else abs(cell[0] - food[0]) + abs(cell[1] - food[1])
+            if distance > best_distance:
+                best, best_distance = direction, distance
+        return best
+
+    def step_toward(self, head, cell):
+        offset = (cell[0] - head[0], cell[1] - head[1])
+        for direction, delta in DIRECTIONS.items():
+            if delta == offset:
+                return direction
+
+    def fallback(self, snake, release):
+        head = snake[0]
+        behind = snake[1] if len(snake) > 1 else None
+        best, best_space = None, -1
+        for direction, cell in self.neighbors(head):
+            if cell == behind or release.get(cell, 0) > 1:
+                continue
+            space = sum(release.get(neighbor, 0) <= 2 for _, neighbor in self.neighbors(cell))
+            if space > best_space:
+                best, best_space = direction, space
+        return best
+
+    def decide(self, snake, food, deadline):
+        head = snake[0]
+        if self.path and self.food == food and self.path[0] == head:
+            self.path.popleft()
+            if self.path:
+                self.reused += 1
+                return self.step_toward(head, self.path[0])
+
+        self.path = deque()
+        self.food = food
+        self.searches += 1
+        release = self.release_times(snake)
+        behind = snake[1] if len(snake) > 1 else None
+        try:
+            if food is not None:
+                path = self.search(head, food, release, deadline, blocked=behind)
+                if path and self.is_safe(snake, path, deadline):
+                    self.path = path
+                    return self.step_toward(head, path[0])
+            move = self.wander(snake, food, deadline)
+            if move is not None:
+                return move
+        except PlannerTimeout:
+            self.timeouts += 1
+        return self.fallback(snake, release)
+
+class Autopilot:
+    def __init__(self, columns, rows, budget):
+        self.planner = PathPlanner(columns, rows)
+        self.budget = budget
+        self.moves = queue.SimpleQueue()
+        self.condition = threading.Condition()
+        self.pending = None
+        self.snapshot = None
+        self.updates = []
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, name='autopilot', daemon=True)
+        self.thread.start()
+
+    def submit(self, tick, snake, food):
+        snapshot = tuple(snake)
+        with self.condition:
+            self.snapshot = snapshot
+            self.updates = []
+            self.pending = (tick, food, time.perf_counter())
+            self.condition.notify()
+
+    def advance(self, tick, head, length, food):
+        with self.condition:
+            self.updates.append((head, length))
+            self.pending = (tick, food, time.perf_counter())
+            self.condition.notify()
+
+    def run(self):
+        snake = deque()
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                if self.snapshot is not None:
+                    snake = deque(self.snapshot)
+                    self.snapshot = None
+                updates = self.updates
+                self.updates = []
+                tick, food, submitted = self.pending
+                self.pending = None
+            for head, length in updates:
+                snake.appendleft(head)
+                while len(snake) > length:
+                    snake.pop()
+            move = self.planner.decide(snake, food, submitted + self.budget)
+            self.moves.put((tick, move, time.perf_counter() - submitted))
+
+    def poll(self, tick):
+        move, latency = None, None
+        while True:
+            try:
+                decided, decided_move, decided_latency = self.moves.get_nowait()
+            except queue.Empty:
+                return move, latency
+            if decided == tick:
+                move, latency = decided_move, decided_latency
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+class RollingHistogram:
+    def __init__(self, window=600):
+        self.samples = deque(maxlen=window)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def add(self, value):
+        self.samples.append(value)
+
+    def percentiles(self, *percents):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return [0.0 for _ in percents]
+        last = len(ordered) - 1
+        return [ordered[min(last, int(round(percent / 100 * last)))] for percent in percents]
+
+class PerfStats:
+    PHASES = ('move', 'collision', 'render', 'timer', 'cursor', 'tick', 'input', 'autopilot')
+
+    def __init__(self, window=600):
+        self.histograms = {phase: RollingHistogram(window) for phase in self.PHASES}
+
+    def record(self, phase, seconds):
+        self.histograms[phase].add(seconds)
+
+    def summary(self):
+        summary = {}
+        for phase, histogram in self.histograms.items():
+            p50, p95, p99 = histogram.percentiles(50, 95, 99)
+            summary[phase] = {'samples': len(histogram), 'p50_ms': p50 * 1000, 'p95_ms': p95 * 1000, 'p99_ms': p99 * 1000}
+        return summary
+
+    def format(self):
+        lines = [f'{"phase":<10}{"p50":>8}{"p95":>8}{"p99":>8}']
+        for phase, values in self.summary().items():
+            lines.append(f'{phase:<10}{values["p50_ms"]:>8.2f}{values["p95_ms"]:>8.2f}{values["p99_ms"]:>8.2f}')
+        return '\n'.join(lines)
+
+    def report(self, **extra):
+        return dict(extra, phases=self.summary())
+
+class SnakeRenderer:
+    def __init__(self, canvas, size, color, tag='snake'):
+        self.canvas = canvas
+        self.size = size
+        self.color = color
+        self.tag = tag
+        self.items = deque()
+        self.head = None
+
+    def reset(self):
+        self.canvas.delete(self.tag)
+        self.items.clear()
+        self.head = None
+
+    def redraw(self, snake):
+        self.reset()
+        size = self.size
+        for x, y in snake:
+            self.items.append(self.canvas.create_rectangle(x * size, y * size, (x + 1) * size, (y + 1) * size, fill=self.color, tags=self.tag))
+        if self.items:
+            self.head = snake[0]
+
+    def render(self, snake):
+        length = len(snake)
+        if length == 0:
+            self.reset()
+            return
+        head = snake[0]
+        if head == self.head and length == len(self.items):
+            return
+        grew = length - len(self.items)
+        if not self.items or grew not in (0, 1) or (length > 1 and snake[1] != self.head):
+            self.redraw(snake)
+            return
+
+        x, y = head
+        size = self.size
+        if grew:
+            item = self.canvas.create_rectangle(x * size, y * size, (x + 1) * size, (y + 1) * size, fill=self.color, tags=self.tag)
+        else:
+            item = self.items.pop()
+            self.canvas.coords(item, x * size, y * size, (x + 1) * size, (y + 1) * size)
+        self.items.appendleft(item)
+        self.head = head
+
+    def bbox(self, cell):
+        x, y = cell
+        size = self.size
+        return x * size, y * size, (x + 1) * size, (y + 1) * size
+
+    def render_food(self, food, color):
+        self.canvas.delete('food')
+        box = None if food is None else self.bbox(food)
+        if box is not None:
+            self.canvas.create_rectangle(*box, fill=color, tags='food')
+
+class RasterRenderer:
+    def __init__(self, canvas, size, color, columns, rows, tag='snake'):
+        self.canvas = canvas
+        self.size = size
+        self.color = color
+        self.tag = tag
+        self.width = columns * size
+        self.height = rows * size
+        self.background = canvas.cget('background')
+        self.image = tk.PhotoImage(master=canvas, width=self.width, height=self.height)
+        self.cells = {}
+        self.food = None
+        self.food_color = None
+        self.head = None
+        self.tail = None
+        self.length = 0
+        self.reset()
+
+    def reset(self):
+        self.canvas.delete(self.tag)
+        self.image.put(self.background, to=(0, 0, self.width, self.height))
+        self.canvas.tag_lower(self.canvas.create_image(0, 0, anchor='nw', image=self.image, tags=self.tag))
+        self.cells.clear()
+        self.head = None
+        self.tail = None
+        self.length = 0
+        if self.food is not None:
+            self.paint(self.food, self.food_color)
+
+    def bbox(self, cell):
+        x, y = cell
+        size = self.size
+        return x * size, y * size, (x + 1) * size, (y + 1) * size
+
+    def paint(self, cell, color):
+        self.image.put(color, to=self.bbox(cell))
+
+    def add(self, cell):
+        count = self.cells.get(cell, 0)
+        self.cells[cell] = count + 1
+        if not count:
+            self.paint(cell, self.color)
+
+    def remove(self, cell):
+        count = self.cells.pop(cell, 0) - 1
+        if count > 0:
+            self.cells[cell] = count
+        elif not count:
+            self.paint(cell, self.food_color if cell == self.food else self.background)
+
+    def redraw(self, snake):
+        self.reset()
+        for cell in snake:
+            self.add(cell)
+        if len(snake):
+            self.head = snake[0]
+            self.tail = snake[-1]
+            self.length = len(snake)
+
+    def render(self, snake):
+        length = len(snake)
+        if length == 0:
+            self.reset()
+            return
+        head = snake[0]
+        if head == self.head and length == self.length:
+            return
+        grew = length - self.length
+        if not self.length or grew not in (0, 1) or (length > 1 and snake[1] != self.head):
+            self.redraw(snake)
+            return
+        if not grew:
+            self.remove(self.tail)
+        self.add(head)
+        self.head = head
+        self.tail = snake[-1]
+        self.length = length
+
+    def render_food(self, food, color):
+        previous = self.food
+        self.food = food
+        self.food_color = color
+        if previous is not None and previous != food and previous not in self.cells:
+            self.paint(previous, self.background)
+        if food is not None and food not in self.cells:
+            self.paint(food, color)
+
+class ArenaRenderer:
+    def __init__(self, canvas, size, columns, rows, colors, ai_color, food_color, tag='snake'):
+        self.canvas = canvas
+        self.size = size
+        self.colors = colors
+        self.ai_color = ai_color
+        self.food_color = food_color
+        self.tag = tag
+        self.width = columns * size
+        self.height = rows * size
+        self.background = canvas.cget('background')
+        self.image = tk.PhotoImage(master=canvas, width=self.width, height=self.height)
+
+    def reset(self):
+        self.canvas.delete(self.tag)
+        self.image.put(self.background, to=(0, 0, self.width, self.height))
+        self.canvas.tag_lower(self.canvas.create_image(0, 0, anchor='nw', image=self.image, tags=self.tag))
+
+    def bbox(self, cell):
+        x, y = cell
+        size = self.size
+        return x * size, y * size, (x + 1) * size, (y + 1) * size
+
+    def color_at(self, arena, cell):
+        owner = arena.occupied.get(cell)
+        if owner is not None:
+            return self.colors[owner] if owner < len(self.colors) else self.ai_color
+        return self.food_color if cell in arena.food else self.background
+
+    def redraw(self, arena):
+        self.reset()
+        arena.changes()
+        for cell in arena.occupied:
+            self.image.put(self.color_at(arena, cell), to=self.bbox(cell))
+        for cell in arena.food_list:
+            self.image.put(self.food_color, to=self.bbox(cell))
+
+    def render(self, arena):
+        put = self.image.put
+        for cell in set(arena.changes()):
+            put(self.color_at(arena, cell), to=self.bbox(cell))
+
+class ChunkIndex:
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.chunks = {}
+
+    def __contains__(self, cell):
+        chunk = self.chunks.get((cell[0] // self.chunk_size, cell[1] // self.chunk_size))
+        return chunk is not None and cell in chunk
+
+    def clear(self):
+        self.chunks.clear()
+
+    def add(self, cell):
+        key = (cell[0] // self.chunk_size, cell[1] // self.chunk_size)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = {}
+        chunk[cell] = chunk.get(cell, 0) + 1
+
+    def discard(self, cell):
+        key = (cell[0] // self.chunk_size, cell[1] // self.chunk_size)
+        chunk = self.chunks.get(key)
+        if chunk is None or cell not in chunk:
+            return
+        count = chunk[cell] - 1
+        if count:
+            chunk[cell] = count
+        else:
+            del chunk[cell]
+            if not chunk:
+                del self.chunks[key]
+
+    def query(self, x0, y0, x1, y1):
+        size = self.chunk_size
+        for cy in range(y0 // size, (y1 - 1) // size + 1):
+            for cx in range(x0 // size, (x1 - 1) // size + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk:
+                    for x, y in chunk:
+                        if x0 <= x < x1 and y0 <= y < y1:
+                            yield x, y
+
+class ViewportRenderer:
+    def __init__(self, canvas, size, color, columns, rows, view_columns, view_rows, tag='snake', chunk_size=CHUNK_SIZE):
+        self.canvas = canvas
+        self.size = size
+        self.color = color
+        self.tag = tag
+        self.columns = columns
+        self.rows = rows
+        self.view_columns = min(view_columns, columns)
+        self.view_rows = min(view_rows, rows)
+        self.margin_x = self.view_columns // 4
+        self.margin_y = self.view_rows // 4
+        self.index = ChunkIndex(chunk_size)
+        self.items = {}
+        self.origin = (0, 0)
+        self.head = None
+        self.tail = None
+        self.length = 0
+
+    def reset(self):
+        self.canvas.delete(self.tag)
+        self.items.clear()
+        self.index.clear()
+        self.head = None
+        self.tail = None
+        self.length = 0
+
+    def bbox(self, cell):
+        x = cell[0] - self.origin[0]
+        y = cell[1] - self.origin[1]
+        if 0 <= x < self.view_columns and 0 <= y < self.view_rows:
+            size = self.size
+            return x * size, y * size, (x + 1) * size, (y + 1) * size
+        return None
+
+    def follow(self, head):
+        ox, oy = self.origin
+        x, y = head
+        if (self.margin_x <= x - ox < self.view_columns - self.margin_x
+                and self.margin_y <= y - oy < self.view_rows - self.margin_y):
+            return False
+        origin = (max(0, min(x - self.view_columns // 2, self.columns - self.view_columns)),
+                  max(0, min(y - self.view_rows // 2, self.rows - self.view_rows)))
+        if origin == self.origin:
+            return False
+        self.origin = origin
+        return True
+
+    def draw_visible(self):
+        self.canvas.delete(self.tag)
+        self.items.clear()
+        ox, oy = self.origin
+        for cell in self.index.query(ox, oy, ox + self.view_columns, oy + self.view_rows):
+            self.items[cell] = self.canvas.create_rectangle(*self.bbox(cell), fill=self.color, tags=self.tag)
+
+    def redraw(self, snake):
+        self.reset()
+        for cell in snake:
+            self.index.add(cell)
+        if len(snake):
+            self.head = snake[0]
+            self.tail = snake[-1]
+            self.length = len(snake)
+            self.follow(self.head)
+        self.draw_visible()
+        return True
+
+    def render(self, snake):
+        length = len(snake)
+        if length == 0:
+            self.reset()
+            return False
+        head = snake[0]
+        if head == self.head and length == self.length:
+            return False
+        grew = length - self.length
+        if not self.length or grew not in (0, 1) or (length > 1 and snake[1] != self.head):
+            return self.redraw(snake)
+
+        item = None
+        if not grew:
+            self.index.discard(self.tail)
+            if self.tail not in self.index:
+                item = self.items.pop(self.tail, None)
+        self.index.add(head)
+        self.head = head
+        self.tail = snake[-1]
+        self.length = length
+
+        if self.follow(head):
+            if item is not None:
+                self.canvas.delete(item)
+            self.draw_visible()
+            return True
+        box = self.bbox(head)
+        if box is None:
+            if item is not None:
+                self.canvas.delete(item)
+        elif item is None:
+            self.items[head] = self.canvas.create_rectangle(*box, fill=self.color, tags=self.tag)
+        else:
+            self.canvas.coords(item, *box)
+            self.items[head] = item
+        return False
+
+    render_food = SnakeRenderer.render_food
+
+class ScoreTable(CustomFrame):
+    def __init__(self, master, store, difficulty, format_timestamp, app_theme=None, page_size=15, **kwargs):
+        super().__init__(master, app_theme=app_theme, **kwargs)
+        self.store = store
+        self.difficulty = difficulty
+        self.format_timestamp = format_timestamp
+        self.page_size = page_size
+        self.offset = 0
+        self.total = 0
+
+        self.tree = CustomTreeview(self, columns=('Rank', 'Name', 'Score', 'Duration', 'Date'), show='headings',
+                                   selectmode='extended', height=page_size, app_theme=app_theme)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill='both', expand=True)
+
+        for column, width, anchor in (('Rank', 50, 'center'), ('Name', 100, 'w'), ('Score', 50, 'center'),
+                                      ('Duration', 100, 'center'), ('Date', 200, 'center')):
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=width, anchor=anchor)
+
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self.on_mouse_wheel)
+        self.tree.bind('<Prior>', lambda event: self.scroll_to(self.offset - self.page_size))
+        self.tree.bind('<Next>', lambda event: self.scroll_to(self.offset + self.page_size))
+
+        self.refresh()
+
+    def refresh(self):
+        self.total = self.store.count(self.difficulty)
+        self.scroll_to(self.offset)
+
+    def scroll_to(self, offset):
+        self.offset = max(0, min(int(offset), self.total - self.page_size))
+        self.tree.delete(*self.tree.get_children())
+        rows = self.store.page(self.difficulty, self.offset, self.page_size)
+        for rank, (game_id, _, name, score, duration, timestamp, replay) in enumerate(rows, start=self.offset + 1):
+            self.tree.insert('', 'end', iid=str(game_id), values=(rank, name, score, duration, self.format_timestamp(timestamp), replay))
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, min(1.0, (self.offset + self.page_size) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        return 'break'
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == 'moveto':
+            return self.scroll_to(float(amount) * self.total)
+        step = self.page_size if unit == 'pages' else 1
+        return self.scroll_to(self.offset + int(amount) * step)
+
+    def on_mouse_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            return self.scroll_to(self.offset - 3)
+        return self.scroll_to(self.offset + 3)
+
+    def selected_values(self):
+        return [self.tree.item(item)['values'] for item in self.tree.selection()]
+
 class SnakeGame:
-    def __init__(self, master):
+    def __init__(self, master, startup_report=False, renderer=None):
+        self.startup_started = time.perf_counter()
+        self.startup_timings = []
+        self.startup_report = startup_report
         self.master = master
         self.master.title('Snake')
         self.settings = self.load_settings()
+        self.mark_startup('settings')
         self.current_app_theme = self.settings.get('app_theme', 'Default Theme')
         self.current_game_theme = self.settings.get('game_theme', 'Default Theme')
         self.app_theme = app_themes[self.current_app_theme]
-        self.game_theme = game_themes[self.current_game_theme]
+        self.game_theme = GameTheme(game_themes[self.current_game_theme])
+        self.mark_startup('themes')
 
         self.master.protocol('WM_DELETE_WINDOW', self.on_closing)
         
-        self.game_loop_id = None
-        self.direction_queue = []
+        self.scheduler = None
+        self.direction_queue = InputQueue()
+        self.recorder = None
+        self.replay_path = None
+        self.score_store = None
+        self.persister = Persister()
+        self.record_replays = self.settings.get('record_replays', True)
+        self.renderer_backend = renderer or self.settings.get('renderer', 'items')
 
         self.player_name = tk.StringVar(value=self.settings.get('player_name', ''))
+        self.timestamp_cache = {}
 
         self.movement_keys = self.settings.get('movement_keys', {'s': 'Left', 'e': 'Up', 'f': 'Right', 'd': 'Down'})
+        self.second_player_keys = self.settings.get('second_player_keys', {'Left': 'Left', 'Up': 'Up', 'Right': 'Right', 'Down': 'Down'})
+        self.arena_snakes = self.settings.get('arena_snakes', ARENA_SNAKES)
+        self.arena_players = self.settings.get('arena_players', ARENA_PLAYERS)
+        self.arena = None
+        self.arena_inputs = []
         self.pause_key = self.settings.get('pause_key', 'space')
+        self.profile_key = self.settings.get('profile_key', 'F9')
+        self.profiler = None
+        self.profiled_ticks = 0
+        self.stats_key = self.settings.get('stats_key', 'F3')
+        self.autopilot_key = self.settings.get('autopilot_key', 'F5')
+        self.rewind_key = self.settings.get('rewind_key', 'BackSpace')
+        self.autopilot = None
+        self.assisted = False
+        self.perf_stats = PerfStats()
+        self.show_stats = False
 
         self.apply_theme()
         self.setup_ui()
-        self.load_high_scores()
+        self.mark_startup('widgets')
         self.initialize_game_state()
+        self.mark_startup('game state')
 
         self.master.bind('<KeyPress>', self.change_direction)
         self.master.bind(f'<{self.pause_key}>', self.toggle_pause)
+        self.master.bind(f'<{self.profile_key}>', self.toggle_profiler)
+        self.master.bind(f'<{self.stats_key}>', self.toggle_stats)
+        self.master.bind(f'<{self.autopilot_key}>', self.toggle_autopilot)
+        self.master.bind(f'<{self.rewind_key}>', self.rewind_game)
+        self.master.after_idle(self.mark_first_frame)
+
+    def mark_startup(self, phase):
+        self.startup_timings.append((phase, time.perf_counter() - self.startup_started))
+
+    def mark_first_frame(self):
+        self.master.update_idletasks()
+        self.mark_startup('first frame')
+        if self.startup_report:
+            print(self.format_startup_report())
+
+    def format_startup_report(self):
+        lines = ['Startup timings:']
+        previous = 0.0
+        for phase, elapsed in self.startup_timings:
+            lines.append(f'  {phase:<12}{(elapsed - previous) * 1000:>8.1f} ms  (total {elapsed * 1000:.1f} ms)')
+            previous = elapsed
+        return '\n'.join(lines)
 
     def setup_ui(self):
         self.toolbar = CustomFrame(self.master, app_theme=self.app_theme)
@@ -437,6 +2036,9 @@ class SnakeGame:
         self.start_button = CustomButton(self.toolbar, text='Start New Game', command=self.start_game, app_theme=self.app_theme)
         self.start_button.pack(side=tk.LEFT, padx=self.app_theme['padx'], pady=self.app_theme['pady'])
 
+        self.arena_button = CustomButton(self.toolbar, text='Arena', command=self.start_arena, app_theme=self.app_theme)
+        self.arena_button.pack(side=tk.LEFT, padx=self.app_theme['padx'], pady=self.app_theme['pady'])
+
         self.speed_var = tk.StringVar(value=self.settings.get('speed', 'Medium'))
         self.speed_menu = CustomOptionMenu(self.toolbar, self.speed_var, *list(SPEED_OPTIONS.keys()), app_theme=self.app_theme)
         self.speed_menu.pack(side=tk.LEFT, padx=self.app_theme['padx'], pady=self.app_theme['pady'])
@@ -450,10 +2052,10 @@ class SnakeGame:
         self.scores_button = CustomButton(self.toolbar, text='Top Scores', command=self.show_high_scores, app_theme=self.app_theme)
         self.scores_button.pack(side=tk.LEFT, padx=self.app_theme['padx'], pady=self.app_theme['pady'])
 
-        self.exit_button = CustomButton(self.toolbar, text='Exit', command=self.master.quit, app_theme=self.app_theme)
+        self.exit_button = CustomButton(self.toolbar, text='Exit', command=self.on_closing, app_theme=self.app_theme)
         self.exit_button.pack(side=tk.LEFT, padx=self.app_theme['padx'], pady=self.app_theme['pady'])
 
-        self.canvas = tk.Canvas(self.master, width=self.game_theme['canvas_width'], height=self.game_theme['canvas_height'], background='black')
+        self.canvas = tk.Canvas(self.master, width=self.game_theme.canvas_width, height=self.game_theme.canvas_height, background='black')
         self.canvas.pack()
 
         self.draw_title_screen()
@@ -471,14 +2073,12 @@ class SnakeGame:
         self.difficulty_label.pack(side=tk.LEFT, padx=self.app_theme['padx'], pady=self.app_theme['pady'])
 
     def initialize_game_state(self):
-        self.snake = [INITIAL_POSITION]
-        self.food = [self.create_food()]
-        self.direction = 'Right'
+        self.engine = self.create_engine()
         self.running = False
         self.paused = False
-        self.start_time = None
-        self.last_time = None
-        self.elapsed_time = 0
+        self.game_difficulty = self.speed_var.get()
+        self.tick_interval_ms = SPEED_OPTIONS[self.game_difficulty]
+        self.replay_cursor = None
 
     def load_settings(self):
         try:
@@ -493,72 +2093,250 @@ class SnakeGame:
             'speed': self.speed_var.get(),
             'player_name': self.player_name.get(),
             'movement_keys': self.movement_keys,
+            'second_player_keys': self.second_player_keys,
+            'arena_snakes': self.arena_snakes,
+            'arena_players': self.arena_players,
             'pause_key': self.pause_key,
+            'profile_key': self.profile_key,
+            'stats_key': self.stats_key,
+            'autopilot_key': self.autopilot_key,
+            'rewind_key': self.rewind_key,
+            'record_replays': self.record_replays,
+            'renderer': self.renderer_backend,
             'app_theme': self.current_app_theme,
             'game_theme': self.current_game_theme
         }
-        with open(f'{FILE_PATH}/settings.json', 'w') as file:
-            json.dump(settings, file, indent=4)
+        self.persister.save_json(f'{FILE_PATH}/settings.json', settings)
 
     def restore_settings(self):
         if 'geometry' in self.settings:
             self.master.geometry(self.settings['geometry'])
 
     def on_closing(self):
+        if self.profiler:
+            self.stop_profiler(show=False)
+        self.stop_autopilot()
+        self.stop_recording(wait=True)
         self.save_settings()
+        self.persister.close()
+        if self.score_store:
+            self.score_store.close()
         self.master.destroy()
 
     def start_game(self):
-        if self.game_loop_id:
-            self.master.after_cancel(self.game_loop_id)
+        if self.scheduler:
+            self.scheduler.stop()
+            self.scheduler = None
 
         self.canvas.delete('all')
-        self.snake = [INITIAL_POSITION]
-        self.food = [self.create_food()]
-        self.direction = 'Right'
+        self.direction_queue.clear()
+        self.stop_autopilot()
+        self.arena = None
+        self.assisted = False
+        self.snake_renderer = self.create_renderer(self.game_theme.columns, self.game_theme.rows, self.game_theme.snake_size)
+        self.stop_recording()
+        self.game_difficulty = self.speed_var.get()
+        self.tick_interval_ms = SPEED_OPTIONS[self.game_difficulty]
+        seed = random.getrandbits(64)
+        self.engine = self.create_engine(seed)
+        self.start_recording(seed)
         self.running = True
         self.paused = False
-        self.start_time = time.time()
-        self.last_time = self.start_time
-        self.elapsed_time = 0
+        self.replay_cursor = None
+        self.canvas.config(width=self.game_theme.canvas_width, height=self.game_theme.canvas_height)
         self.canvas.delete('game_over')
 
         self.render_food()
         self.update_labels()
+        self.perf_stats = PerfStats()
+        self.render_stats()
         self.master.config(cursor='none')
-        self.game_loop()
+        self.scheduler = FixedTimestepScheduler(self.master, self.tick_interval_ms, self.game_tick)
+        self.scheduler.start()
+
+    def play_replay(self, path, speed=1):
+        try:
+            replay = load_replay(path)
+        except (OSError, ValueError) as error:
+            CustomMessageBox(self.master, title='Replay', message=f'Could not load the replay:\n{error}', app_theme=self.app_theme)
+            return
+        if self.scheduler:
+            self.scheduler.stop()
+            self.scheduler = None
+        self.stop_recording()
+        self.stop_autopilot()
+        self.arena = None
+
+        self.canvas.delete('all')
+        self.direction_queue.clear()
+        self.snake_renderer = self.create_renderer(replay.columns, replay.rows, replay.snake_size)
+        if isinstance(self.snake_renderer, ViewportRenderer):
+            self.canvas.config(width=self.game_theme.canvas_width, height=self.game_theme.canvas_height)
+        else:
+            self.canvas.config(width=replay.columns * replay.snake_size, height=replay.rows * replay.snake_size)
+        self.engine = replay.create_engine()
+        self.replay = replay
+        self.replay_cursor = ReplayCursor(replay.events)
+        self.running = True
+        self.paused = False
+        self.tick_interval_ms = replay.interval_ms
+
+        self.render_food()
+        self.update_labels()
+        self.perf_stats = PerfStats()
+        self.render_stats()
+        self.scheduler = FixedTimestepScheduler(self.master, replay.interval_ms / speed, self.game_tick)
+        self.scheduler.start()
+
+    def start_arena(self, snakes=None, players=None):
+        from arena import Arena, arena_side
+
+        if snakes is not None:
+            self.arena_snakes = snakes
+        if players is not None:
+            self.arena_players = players
+        if self.scheduler:
+            self.scheduler.stop()
+            self.scheduler = None
+        self.stop_recording()
+        self.stop_autopilot()
+
+        theme = self.game_theme
+        self.canvas.delete('all')
+        self.direction_queue.clear()
+        canvas_side = min(theme.canvas_width, theme.canvas_height)
+        side = min(arena_side(self.arena_snakes), canvas_side)
+        size = canvas_side // side
+        self.canvas.config(width=side * size, height=side * size)
+        self.arena = Arena(side, side, self.arena_snakes, players=self.arena_players, track_changes=True)
+        self.arena_inputs = [InputQueue() for _ in range(self.arena_players)]
+        colors = (theme.snake_color, theme.logo_color)[:self.arena_players]
+        self.arena_renderer = ArenaRenderer(self.canvas, size, side, side, colors, self.dim_color(theme.snake_color), theme.food_color)
+        self.arena_renderer.redraw(self.arena)
+        self.running = True
+        self.paused = False
+        self.assisted = True
+        self.game_difficulty = self.speed_var.get()
+        self.tick_interval_ms = SPEED_OPTIONS[self.game_difficulty]
+        self.replay_cursor = None
+
+        self.update_arena_labels()
+        self.perf_stats = PerfStats()
+        self.render_stats()
+        self.master.config(cursor='none')
+        self.scheduler = FixedTimestepScheduler(self.master, self.tick_interval_ms, self.game_tick)
+        self.scheduler.start()
+
+    def dim_color(self, color):
+        red, green, blue = (value // 512 for value in self.canvas.winfo_rgb(color))
+        return f'#{red:02X}{green:02X}{blue:02X}'
+
+    def update_arena_labels(self):
+        players = self.arena.snakes[:self.arena_players]
+        alive = self.arena.alive_count()
+        if players:
+            lengths = ' / '.join(str(len(snake)) for snake in players)
+            self.score_label.config(text=f'Length: {lengths}  Alive: {alive}')
+        else:
+            self.score_label.config(text=f'Alive: {alive}')
+
+    def arena_loop(self):
+        if self.running and not self.paused:
+            perf_counter = time.perf_counter
+            actions = {}
+            pressed = []
+            for index, inputs in enumerate(self.arena_inputs):
+                action, timestamp = inputs.pop()
+                if action is not None:
+                    actions[index] = action
+                    pressed.append(timestamp)
+            start = perf_counter()
+            self.arena.step(actions)
+            moved = perf_counter()
+            self.arena_renderer.render(self.arena)
+            rendered = perf_counter()
+            for timestamp in pressed:
+                self.perf_stats.record('input', moved - timestamp)
+            self.update_arena_labels()
+            self.update_timer()
+            end = perf_counter()
+
+            self.perf_stats.record('move', moved - start)
+            self.perf_stats.record('render', rendered - moved)
+            self.perf_stats.record('timer', end - rendered)
+            self.perf_stats.record('tick', end - start)
+            if self.arena_players and not any(snake.alive for snake in self.arena.snakes[:self.arena_players]):
+                self.running = False
+            if self.show_stats and self.scheduler.ticks % 10 == 0:
+                self.render_stats()
+        else:
+            self.master.config(cursor='')
+
+    @property
+    def snake(self):
+        return self.engine.state.snake
+
+    @property
+    def food(self):
+        return self.engine.state.food
+
+    def create_renderer(self, columns, rows, size):
+        view_columns = self.game_theme.canvas_width // size
+        view_rows = self.game_theme.canvas_height // size
+        if columns <= view_columns and rows <= view_rows:
+            if self.renderer_backend == 'raster':
+                return RasterRenderer(self.canvas, size, self.game_theme.snake_color, columns, rows)
+            return SnakeRenderer(self.canvas, size, self.game_theme.snake_color)
+        return ViewportRenderer(self.canvas, size, self.game_theme.snake_color, columns, rows, view_columns, view_rows)
+
+    def create_engine(self, seed=None):
+        theme = self.game_theme
+        return Engine(theme.columns, theme.rows, start=theme.start, rng=random.Random(seed), history=REWIND_HISTORY)
+
+    def start_recording(self, seed):
+        self.stop_recording()
+        self.replay_path = None
+        if not self.record_replays:
+            return
+        engine = self.engine
+        self.replay_path = f'{REPLAY_DIR}/{datetime.now().strftime("%Y%m%d-%H%M%S")}-{seed:016x}.snkr'
+        self.recorder = ReplayRecorder(self.replay_path, seed, self.tick_interval_ms,
+                                       engine.columns, engine.rows, self.game_theme.snake_size, engine.start)
+
+    def stop_recording(self, wait=False):
+        if self.recorder:
+            self.recorder.close(self.engine.state.ticks, len(self.snake))
+            if wait:
+                self.recorder.wait(timeout=2)
+            self.recorder = None
 
     def create_food(self):
-        max_x = int(self.game_theme['canvas_width']) // int(self.game_theme['snake_size']) - 1
-        max_y = int(self.game_theme['canvas_height']) // int(self.game_theme['snake_size']) - 1
-        while True:
-            food = (random.randint(0, max_x) * int(self.game_theme['snake_size']), random.randint(0, max_y) * int(self.game_theme['snake_size']))
-            if food not in self.snake:
-                return food
+        return self.engine.create_food()
 
     def render_snake(self):
-        self.canvas.delete('snake')
-        for x, y in self.snake:
-            self.canvas.create_rectangle(x, y, x + int(self.game_theme['snake_size']), y + int(self.game_theme['snake_size']), fill=self.game_theme['snake_color'], tags='snake')
+        if self.snake_renderer.render(self.snake):
+            self.render_food()
 
     def render_food(self):
-        self.canvas.delete('food')
-        x, y = self.food[0]
-        self.canvas.create_rectangle(x, y, x + int(self.game_theme['snake_size']), y + int(self.game_theme['snake_size']), fill=self.game_theme['food_color'], tags='food')
+        self.snake_renderer.render_food(self.food, self.game_theme.food_color)
 
     def change_direction(self, event):
         if event.keysym == 'n':
             self.confirm_new_game()
             return
-        if self.paused:
+        if self.arena:
+            if not self.paused:
+                self.steer_arena(event.keysym)
+            return
+        if self.paused or self.replay_cursor or self.autopilot:
             return
         if event.keysym in self.movement_keys:
-            new_dir = self.movement_keys[event.keysym]
-            opposites = {'Left': 'Right', 'Right': 'Left', 'Up': 'Down', 'Down': 'Up'}
-            current_direction = self.direction_queue[-1] if self.direction_queue else self.direction
+            self.direction_queue.push(self.movement_keys[event.keysym], self.engine.state.direction)
 
-            if new_dir != opposites.get(current_direction):
-                self.direction_queue.append(new_dir)
+    def steer_arena(self, keysym):
+        for index, keys in enumerate((self.movement_keys, self.second_player_keys)[:self.arena_players]):
+            if keysym in keys:
+                self.arena_inputs[index].push(keys[keysym], self.arena.snakes[index].direction)
 
     def check_speed_change(self, value):
         if self.running:
@@ -570,50 +2348,201 @@ class SnakeGame:
             return
         self.paused = not self.paused
         if self.paused:
-            current_time = time.time()
-            self.elapsed_time += (current_time - self.last_time)
             self.master.config(cursor='')
         else:
-            self.last_time = time.time()
+            self.direction_queue.restamp()
+            for inputs in self.arena_inputs:
+                inputs.restamp()
             self.master.config(cursor='none')
 
+    def toggle_autopilot(self, event=None):
+        if not self.running or self.paused or self.replay_cursor or self.arena:
+            return
+        if self.autopilot:
+            self.stop_autopilot()
+            return
+        self.autopilot = Autopilot(self.engine.columns, self.engine.rows, budget=self.tick_interval_ms / 2000)
+        self.assisted = True
+        self.direction_queue.clear()
+        self.autopilot.submit(self.engine.state.ticks, self.snake, self.food)
+
+    def stop_autopilot(self):
+        if self.autopilot:
+            self.autopilot.close()
+            self.autopilot = None
+
+    def poll_autopilot(self):
+        move, latency = self.autopilot.poll(self.engine.state.ticks)
+        if latency is not None:
+            self.perf_stats.record('autopilot', latency)
+        return None if move == self.engine.state.direction else move
+
+    def rewind_game(self, event=None):
+        if not self.running or self.replay_cursor or self.arena:
+            return
+        self.apply_rewind(max(1, 1000 // self.tick_interval_ms))
+
+    def apply_rewind(self, ticks):
+        tick = self.engine.state.ticks
+        rewound = self.engine.rewind(ticks)
+        if not rewound:
+            return
+        if self.recorder:
+            self.recorder.rewind(tick, rewound)
+        if not self.replay_cursor:
+            self.assisted = True
+        self.direction_queue.clear()
+        self.render_snake()
+        self.render_food()
+        self.update_labels()
+        self.update_timer()
+        if self.autopilot:
+            self.autopilot.submit(self.engine.state.ticks, self.snake, self.food)
+
+    def game_tick(self):
+        loop = self.arena_loop if self.arena else self.game_loop
+        profiler = self.profiler
+        if profiler is None:
+            loop()
+        else:
+            profiler.enable()
+            try:
+                loop()
+            finally:
+                profiler.disable()
+            self.profiled_ticks += 1
+        if not self.running:
+            self.end_game()
+
+    def end_game(self):
+        self.scheduler.stop()
+        self.stop_autopilot()
+        self.stop_recording()
+        self.show_game_over()
+        self.master.config(cursor='')
+
+    def toggle_profiler(self, event=None):
+        if self.profiler:
+            self.stop_profiler()
+        else:
+            self.start_profiler()
+
+    def start_profiler(self):
+        import cProfile
+
+        self.profiler = cProfile.Profile()
+        self.profiled_ticks = 0
+        self.profile_started = time.perf_counter()
+        self.master.title('Snake (profiling)')
+
+    def stop_profiler(self, show=True):
+        import pstats
+
+        profiler = self.profiler
+        self.profiler = None
+        self.master.title('Snake')
+        elapsed = time.perf_counter() - self.profile_started
+        profiler.create_stats()
+        path = f'{PROFILE_DIR}/snake-{datetime.now().strftime("%Y%m%d-%H%M%S")}.prof'
+
+        def save():
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            profiler.dump_stats(path)
+
+        self.persister.submit(save, key=path)
+        if show:
+            stats = pstats.Stats(profiler).sort_stats('cumulative')
+            self.show_profile(self.format_profile(stats), f'{self.profiled_ticks} ticks in {elapsed:.1f} s, saved {os.path.basename(path)}')
+
+    def format_profile(self, stats, limit=PROFILE_TOP):
+        lines = [f'{"cumulative":>12}{"own":>10}{"calls":>8}  function']
+        for function in stats.fcn_list[:limit]:
+            _, calls, own, cumulative, _ = stats.stats[function]
+            file_name, line, name = function
+            location = f'{os.path.basename(file_name)}:{line}' if line else file_name
+            lines.append(f'{cumulative * 1000:>9.1f} ms{own * 1000:>7.1f} ms{calls:>8}  {name} ({location})')
+        return '\n'.join(lines)
+
+    def show_profile(self, summary, status):
+        dialog = CustomToplevel(self.master, app_theme=self.app_theme, title=f'Profile: {status}')
+        dialog.status_label.config(justify='left', font=('Courier', 9))
+        dialog.set_status(summary, timeout=None)
+
     def game_loop(self):
-        if self.direction_queue:
-            self.direction = self.direction_queue.pop(0)
+        if self.replay_cursor:
+            action = None if self.paused else self.replay_cursor.action_for(self.engine.state.ticks)
+            pressed = None
+            if isinstance(action, int):
+                self.apply_rewind(action)
+                return
+        elif self.paused:
+            action = pressed = None
+        elif self.autopilot:
+            action, pressed = self.poll_autopilot(), None
+        else:
+            action, pressed = self.direction_queue.pop()
 
         if self.running and not self.paused:
-            self.move_snake()
+            perf_counter = time.perf_counter
+            start = perf_counter()
+            self.move_snake(action)
+            moved = perf_counter()
+            if pressed is not None:
+                self.perf_stats.record('input', moved - pressed)
             self.check_collision()
+            checked = perf_counter()
             self.update_timer()
+            timed = perf_counter()
             self.master.config(cursor='none')
+            end = perf_counter()
+
+            self.perf_stats.record('move', moved - start)
+            self.perf_stats.record('collision', checked - moved)
+            self.perf_stats.record('timer', timed - checked)
+            self.perf_stats.record('cursor', end - timed)
+            self.perf_stats.record('tick', end - start)
+            if self.autopilot and self.running:
+                self.autopilot.advance(self.engine.state.ticks, self.snake.head, len(self.snake), self.food)
+            if self.show_stats and self.scheduler.ticks % 10 == 0:
+                self.render_stats()
         else:
             self.master.config(cursor='')
 
-        if self.running:
-            self.game_loop_id = self.master.after(SPEED_OPTIONS[self.speed_var.get()], self.game_loop)
-        else:
-            self.show_game_over()
-            self.master.config(cursor='')
-
-    def move_snake(self):
-        head_x, head_y = self.snake[0]
-        move_offsets = {'Left': (-int(self.game_theme['snake_size']), 0), 'Right': (int(self.game_theme['snake_size']), 0), 'Up': (0, -int(self.game_theme['snake_size'])), 'Down': (0, int(self.game_theme['snake_size']))}
-        head_x += move_offsets[self.direction][0]
-        head_y += move_offsets[self.direction][1]
+    def toggle_stats(self, event=None):
+        self.show_stats = not self.show_stats
+        self.render_stats()
 
-        new_head = (head_x, head_y)
-        self.snake.insert(0, new_head)
-
-        if new_head == self.food[0]:
-            self.food[0] = self.create_food()
+    def render_stats(self):
+        self.canvas.delete('stats')
+        if not self.show_stats:
+            return
+        text = self.perf_stats.format()
+        if self.scheduler:
+            text += f'\n{self.scheduler.tick_rate():.1f} ticks/s, {self.scheduler.skipped_ticks} skipped'
+        self.canvas.create_text(5, 5, text=text, anchor='nw', fill=self.game_theme.gameover_color, font=('Courier', 10), tags='stats')
+
+    def dump_perf_stats(self):
+        report = self.perf_stats.report(timestamp=time.time(),
+                                        speed=self.game_difficulty,
+                                        length=self.arena.segments() if self.arena else len(self.snake),
+                                        ticks=self.scheduler.ticks,
+                                        skipped_ticks=self.scheduler.skipped_ticks,
+                                        tick_rate=self.scheduler.tick_rate(),
+                                        theme_switch_ms=theme_registry.last_apply[1] * 1000)
+        self.persister.save_json(f'{FILE_PATH}/perf_stats.json', report)
+
+    def move_snake(self, action=None):
+        if action is not None and self.recorder:
+            self.recorder.record(self.engine.state.ticks, action)
+        if self.engine.step(action):
             self.render_food()
             self.score_label.config(text=f'Length: {len(self.snake)}')
-        else:
-            self.snake.pop()
 
     def check_collision(self):
-        head_x, head_y = self.snake[0]
-        if head_x < 0 or head_x >= int(self.game_theme['canvas_width']) or head_y < 0 or head_y >= int(self.game_theme['canvas_height']) or self.snake[0] in self.snake[1:]:
+        if not self.engine.state.alive:
+            self.running = False
+        elif (self.replay_cursor and self.replay.complete and self.replay_cursor.finished
+              and self.engine.state.ticks >= self.replay.ticks):
             self.running = False
 
         self.render_snake()
@@ -622,8 +2551,18 @@ class SnakeGame:
         self.update_timer()
         width = int(self.canvas.cget('width'))
         height = int(self.canvas.cget('height'))
-        self.canvas.create_text(width // 2, height // 2, text='Game Over', fill=self.game_theme['gameover_color'], font=(self.get_font(), 24), tags='game_over')
-        self.check_high_score()
+        if self.replay_cursor:
+            text = 'Replay Over'
+        elif not self.arena and self.engine.state.won:
+            text = 'You Win!'
+        else:
+            text = 'Game Over'
+        self.canvas.create_text(width // 2, height // 2, text=text, fill=self.game_theme.gameover_color, font=(self.get_font(), 24), tags='game_over')
+        if self.show_stats:
+            self.render_stats()
+            self.dump_perf_stats()
+        if not self.replay_cursor and not self.assisted and not self.arena:
+            self.check_high_score()
         self.master.config(cursor='')
 
     def format_time(self, seconds):
@@ -636,48 +2575,50 @@ class SnakeGame:
             return f'{seconds}s'
 
     def format_timestamp(self, timestamp):
-        try:
-            dt = datetime.fromtimestamp(float(timestamp))
-            return dt.strftime('%A, %B %d, %Y at %I:%M%p')
-        except ValueError:
-            return timestamp
+        formatted = self.timestamp_cache.get(timestamp)
+        if formatted is None:
+            try:
+                dt = datetime.fromtimestamp(float(timestamp))
+                formatted = dt.strftime('%A, %B %d, %Y at %I:%M%p')
+            except ValueError:
+                formatted = timestamp
+            self.timestamp_cache[timestamp] = formatted
+        return formatted
 
     def update_labels(self):
         self.score_label.config(text=f'Length: {len(self.snake)}')
         self.difficulty_label.config(text=f'Difficulty: {self.speed_var.get()}')
 
+    def game_duration(self):
+        ticks = self.arena.ticks if self.arena else self.engine.state.ticks
+        return replay_duration(ticks, self.tick_interval_ms)
+
     def update_timer(self):
         if not self.paused and self.running:
-            current_time = time.time()
-            total_elapsed = self.elapsed_time + (current_time - self.last_time)
-            self.timer_label.config(text=f'Time: {self.format_time(int(total_elapsed))}')
+            self.timer_label.config(text=f'Time: {self.format_time(self.game_duration())}')
 
     def confirm_new_game(self):
         CustomMessageBox(self.master, title='New Game?', message='Are you sure you want to start a new game?', app_theme=self.app_theme, on_confirm=self.start_game)
 
     def load_high_scores(self):
-        try:
-            with open(f'{FILE_PATH}/top_scores.json', 'r') as file:
-                self.high_scores = json.load(file)
-        except FileNotFoundError:
-            self.high_scores = {'Slow': [], 'Medium': [], 'Fast': []}
-
-    def save_high_scores(self):
-        with open(f'{FILE_PATH}/top_scores.json', 'w') as file:
-            json.dump(self.high_scores, file, indent=4)
+        if self.score_store is None:
+            self.score_store = ScoreStore(f'{FILE_PATH}/scores.sqlite3')
+            self.score_store.import_json(f'{FILE_PATH}/top_scores.json')
+        return self.score_store
 
     def check_high_score(self):
         current_score = len(self.snake)
-        current_time = int(time.time() - self.start_time)
-        difficulty = self.speed_var.get()
-        scores = self.high_scores[difficulty]
-        if len(scores) < 10 or any(current_score > score[1] for score in scores):
+        current_time = self.game_duration()
+        difficulty = self.game_difficulty
+        replay = os.path.basename(self.replay_path or '')
+        name = ''
+        score_store = self.load_high_scores()
+        if score_store.qualifies(difficulty, current_score):
             self.get_user_name()
-            if self.player_name.get():
-                scores.append([self.player_name.get(), current_score, current_time, time.time()])
-                scores.sort(key=lambda x: x[1], reverse=True)
-                self.high_scores[difficulty] = scores[:10]
-                self.save_high_scores()
+            name = self.player_name.get()
+        entry = (difficulty, name, current_score, current_time, time.time(), replay)
+        staged = score_store.stage(*entry)
+        self.persister.submit(lambda: score_store.record(*entry, staged=staged))
 
     def show_high_scores(self):
         scores_window = CustomToplevel(self.master, app_theme=self.app_theme, title='Top Scores')
@@ -690,39 +2631,36 @@ class SnakeGame:
             tab_text = notebook.tab(notebook.select(), 'text')
             scores_window.set_title(f'{tab_text} Speed Top Scores')
 
-        notebook.bind('<<NotebookTabChanged>>', update_title)
+        tabs = {}
+
+        def build_tab(event=None):
+            difficulty = notebook.tab(notebook.select(), 'text')
+            frame = tabs.pop(difficulty, None)
+            if frame is not None:
+                table = ScoreTable(frame, self.load_high_scores(), difficulty, self.format_timestamp, app_theme=self.app_theme)
+                table.pack(fill='both', expand=True)
+                self.create_context_menu(table, difficulty)
+            update_title(event)
+
+        notebook.bind('<<NotebookTabChanged>>', build_tab)
 
         for difficulty in ['Slow', 'Medium', 'Fast']:
             frame = ttk.Frame(notebook)
             notebook.add(frame, text=difficulty)
-
-            tree = CustomTreeview(frame, columns=('Name', 'Score', 'Duration', 'Date'), show='headings', selectmode='extended', app_theme=self.app_theme)
-            tree.pack(fill='both', expand=True)
-
-            tree.heading('Name', text='Name')
-            tree.heading('Score', text='Score')
-            tree.heading('Duration', text='Duration')
-            tree.heading('Date', text='Date')
-
-            tree.column('Name', width=100, anchor='w')
-            tree.column('Score', width=50, anchor='center')
-            tree.column('Duration', width=100, anchor='center')
-            tree.column('Date', width=200, anchor='center')
-
-            if self.high_scores[difficulty]:
-                for score in self.high_scores[difficulty]:
-                    score[3] = self.format_timestamp(score[3])
-                    tree.insert('', 'end', values=score)
-
-            self.create_context_menu(tree, difficulty)
+            tabs[difficulty] = frame
 
         difficulty_to_index = {'Slow': 0, 'Medium': 1, 'Fast': 2}
         current_difficulty_index = difficulty_to_index[self.speed_var.get()]
         notebook.select(current_difficulty_index)
 
-    def create_context_menu(self, tree, difficulty):
+    def create_context_menu(self, table, difficulty):
+        tree = table.tree
         menu = tk.Menu(tree, tearoff=0, background=self.app_theme['background_color'], foreground=self.app_theme['foreground_color'])
-        menu.add_command(label='Delete', command=lambda: self.delete_selected_items(tree, difficulty))
+        menu.add_command(label='Delete', command=lambda: self.delete_selected_items(table, difficulty))
+        replay_menu = tk.Menu(menu, tearoff=0, background=self.app_theme['background_color'], foreground=self.app_theme['foreground_color'])
+        for speed in (1, 4, 16):
+            replay_menu.add_command(label=f'{speed}x', command=lambda speed=speed: self.watch_selected_replay(table, speed))
+        menu.add_cascade(label='Watch Replay', menu=replay_menu)
 
         tree.bind('<Button-3>', lambda event: self.show_context_menu(event, menu, tree))
 
@@ -737,36 +2675,50 @@ class SnakeGame:
         finally:
             menu.grab_release()
 
-    def delete_selected_items(self, tree, difficulty):
-        selected_items = tree.selection()
+    def watch_selected_replay(self, table, speed):
+        selected_values = table.selected_values()
+        if not selected_values:
+            return
+        values = selected_values[0]
+        if len(values) < 6 or not values[5]:
+            CustomMessageBox(self.master, title='Replay', message='No replay was recorded for this score.', app_theme=self.app_theme)
+            return
+        self.play_replay(f'{REPLAY_DIR}/{values[5]}', speed)
+
+    def delete_selected_items(self, table, difficulty):
+        selected_items = table.tree.selection()
         if not selected_items:
             return
 
-        CustomMessageBox(self.master, title='Confirm Deletion', message='Are you sure you want to delete this score?', app_theme=self.app_theme, on_confirm=lambda: self.perform_deletion(tree, difficulty, selected_items))
+        CustomMessageBox(self.master, title='Confirm Deletion', message='Are you sure you want to delete this score?', app_theme=self.app_theme, on_confirm=lambda: self.perform_deletion(table, difficulty, selected_items))
 
-    def perform_deletion(self, tree, difficulty, selected_items):
-        for item in selected_items:
-            tree.delete(item)
+    def perform_deletion(self, table, difficulty, selected_items):
+        score_store = self.load_high_scores()
+        ids = [int(item) for item in selected_items]
+        score_store.unstage(ids)
+        self.persister.submit(lambda: score_store.delete(ids))
+        table.tree.delete(*selected_items)
+        self.when_persisted(table.refresh)
 
-        self.high_scores[difficulty] = [
-            [tree.item(child)['values'][0], tree.item(child)['values'][1], tree.item(child)['values'][2], tree.item(child)['values'][3]]
-            for child in tree.get_children()
-        ]
-        self.save_high_scores()
+    def when_persisted(self, callback):
+        if self.persister.idle():
+            callback()
+        else:
+            self.master.after(20, lambda: self.when_persisted(callback))
 
     def draw_title_screen(self):
         self.title_text = self.canvas.create_text(
-            self.game_theme['canvas_width'] // 2, 
-            self.game_theme['canvas_height'] // 2 - 50, 
+            self.game_theme.canvas_width // 2, 
+            self.game_theme.canvas_height // 2 - 50, 
             text='Snake', 
-            fill=self.game_theme['title_color'], 
+            fill=self.game_theme.title_color, 
             font=(self.get_font(), 44, 'bold')
         )
         self.logo_text = self.canvas.create_text(
-            self.game_theme['canvas_width'] // 2, 
-            self.game_theme['canvas_height'] // 2, 
+            self.game_theme.canvas_width // 2, 
+            self.game_theme.canvas_height // 2, 
             text='How big can your snake get?', 
-            fill=self.game_theme['logo_color'], 
+            fill=self.game_theme.logo_color, 
             font=(self.get_font(), 24)
         )
 
@@ -885,7 +2837,7 @@ class SnakeGame:
             self.current_app_theme = app_theme_var.get()
             self.current_game_theme = game_theme_var.get()
             self.app_theme = app_themes[self.current_app_theme]
-            self.game_theme = game_themes[self.current_game_theme]
+            self.game_theme = GameTheme(game_themes[self.current_game_theme])
             self.apply_theme()
             dialog.destroy()
 
@@ -906,7 +2858,6 @@ class SnakeGame:
             theme_var.set(name)
             self.apply_theme()
             dialog.set_status(f'{theme_type.capitalize()} Theme "{name}" created.')
-            self.update_optionmenus()
 
         themes = app_themes if theme_type == 'app' else game_themes
         theme_var = tk.StringVar(value='')
@@ -919,7 +2870,7 @@ class SnakeGame:
         CustomEntry(editor_frame, textvariable=theme_name_var, app_theme=self.app_theme).grid(row=0, column=1, padx=10, pady=5)
 
         theme_entries = {}
-        default_values = app_themes['Default Theme'] if theme_type == 'app' else game_themes['Default Theme']
+        default_values = app_themes['Default Theme'] if theme_type == 'app' else dict(default_game_theme, **game_themes['Default Theme'])
         for i, (key, value) in enumerate(default_values.items(), start=1):
             CustomLabel(editor_frame, text=f'{key}:', app_theme=self.app_theme).grid(row=i, column=0, padx=10, pady=5)
             entry_var = tk.StringVar(value=value)
@@ -932,9 +2883,14 @@ class SnakeGame:
 
         def save_theme():
             new_theme = {key: var.get() for key, var in theme_entries.items()}
+            if theme_type == 'game':
+                try:
+                    GameTheme(new_theme)
+                except ValueError as error:
+                    editor_window.set_status(str(error))
+                    return
             save_new_theme(theme_name_var.get(), new_theme)
             editor_window.destroy()
-            self.update_optionmenus()
 
         CustomButton(editor_frame, text='Save', command=save_theme, app_theme=self.app_theme).grid(row=i+1, column=0, columnspan=3, pady=10)
 
@@ -959,12 +2915,19 @@ class SnakeGame:
 
         def save_theme():
             new_theme = {key: var.get() for key, var in theme_entries.items()}
+            if theme_type == 'game':
+                try:
+                    compiled = GameTheme(new_theme)
+                except ValueError as error:
+                    dialog.set_status(str(error))
+                    return
+                if theme_name_var.get() == self.current_game_theme:
+                    self.game_theme = compiled
             themes[theme_name_var.get()] = new_theme
             self.save_themes(theme_type, themes)
             theme_var.set(theme_name_var.get())
             self.apply_theme()
             dialog.destroy()
-            self.update_optionmenus()
 
         CustomButton(editor_frame, text='Save', command=save_theme, app_theme=self.app_theme).grid(row=i+1, column=0, pady=10)
 
@@ -978,45 +2941,18 @@ class SnakeGame:
             self.save_themes(theme_type, themes)
             theme_var.set('Default Theme')
             self.apply_theme()
-            self.update_optionmenus()
 
         CustomMessageBox(self.master, title='Confirm Deletion', message=f'Are you sure you want to delete the {theme_var.get()} theme?', app_theme=self.app_theme, on_confirm=perform_delete)
 
     def apply_theme(self):
         self.master.config(background=self.app_theme['background_color'])
-
-        for widget in self.master.winfo_children():
-            self.apply_widget_theme(widget)
-
-        self.update_optionmenus()
-
-    def apply_widget_theme(self, widget):
-        try:
-            if isinstance(widget, (CustomFrame, CustomLabel, CustomButton, CustomEntry, CustomToplevel)):
-                widget.config(background=self.app_theme['background_color'])
-            if isinstance(widget, (CustomLabel, CustomButton, CustomEntry)):
-                widget.config(foreground=self.app_theme['foreground_color'])
-            if isinstance(widget, CustomEntry):
-                widget.config(readonlybackground=self.app_theme['background_color'], disabledforeground=self.app_theme['foreground_color'])
-            if isinstance(widget, CustomButton):
-                widget.config(activebackground=self.app_theme['active_background'], activeforeground=self.app_theme['active_foreground'])
-        except tk.TclError:
-            pass
-        for child in widget.winfo_children():
-            self.apply_widget_theme(child)
-
-    def update_optionmenus(self):
-        for widget in self.master.winfo_children():
-            if isinstance(widget, CustomOptionMenu):
-                widget.configure()
-            for child in widget.winfo_children():
-                if isinstance(child, CustomOptionMenu):
-                    child.configure()
+        widgets, seconds = theme_registry.apply(self.app_theme)
+        if self.startup_report:
+            print(f'Theme "{self.current_app_theme}" applied to {widgets} widgets in {seconds * 1000:.1f} ms')
 
     def save_themes(self, theme_type, themes):
         file_name = 'app_themes.json' if theme_type == 'app' else 'game_themes.json'
-        with open(f'{FILE_PATH}/{file_name}', 'w') as file:
-            json.dump(themes, file, indent=4)
+        self.persister.save_json(f'{FILE_PATH}/{file_name}', dict(themes))
 
     def get_font(self):
         if platform.system() == 'Linux':
@@ -1029,7 +2965,45 @@ class SnakeGame:
     def open_color_chooser(self, entry_var, title):
         CustomColorChooser(self.master, app_theme=self.app_theme, on_color_chosen=lambda color: entry_var.set(color), title=title, initial_color=entry_var.get())
 
+def print_score_verification(workers=None):
+    store = ScoreStore(f'{FILE_PATH}/scores.sqlite3')
+    store.import_json(f'{FILE_PATH}/top_scores.json')
+    start = time.perf_counter()
+    results = verify_scores(store.rows(), workers)
+    elapsed = time.perf_counter() - start
+    store.close()
+    failures = 0
+    for row, (status, detail) in results:
+        if status != 'ok':
+            failures += status == 'mismatch'
+            print(f'{row[1]:<7} {row[2] or "(unnamed)":<20} {row[3]:>6} {row[4]:>6}s  {status} {detail}')
+    verified = sum(1 for _, (status, _) in results if status == 'ok')
+    print(f'{verified}/{len(results)} scores verified in {elapsed:.2f}s, {failures} mismatched')
+    return 1 if failures else 0
+
 if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Snake')
+    parser.add_argument('--verify-scores', action='store_true', help='re-simulate the replay of every recorded game and report mismatches')
+    parser.add_argument('--workers', type=int, help='processes used by --verify-scores')
+    parser.add_argument('--replay', metavar='FILE', help='play back a recorded game')
+    parser.add_argument('--replay-speed', type=int, choices=(1, 4, 16), default=1)
+    parser.add_argument('--startup-report', action='store_true', help='print how long each startup phase took')
+    parser.add_argument('--renderer', choices=RENDERERS, help='draw the snake as canvas items or into a single image (saved as the default)')
+    parser.add_argument('--arena', type=int, metavar='SNAKES', help='start an arena with this many snakes (saved as the default)')
+    parser.add_argument('--players', type=int, choices=(0, 1, 2), help='keyboard players for --arena; the second uses the arrow keys (saved as the default)')
+    args = parser.parse_args()
+    if args.arena is not None and args.arena < max(1, args.players or 0):
+        parser.error('--arena needs at least one snake per player')
+
+    if args.verify_scores:
+        raise SystemExit(print_score_verification(args.workers))
+
     root = tk.Tk()
-    game = SnakeGame(root)
+    game = SnakeGame(root, startup_report=args.startup_report, renderer=args.renderer)
+    if args.replay:
+        game.play_replay(args.replay, args.replay_speed)
+    elif args.arena is not None:
+        game.start_arena(args.arena, args.players)
     root.mainloop()
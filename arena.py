@@ -0,0 +1,183 @@
+import math
+import random
+from collections import deque
+
+from Snake import DIRECTIONS, OPPOSITES, greedy_move
+
+FOOD_PER_SNAKE = 1
+SPAWN_ATTEMPTS = 64
+CELLS_PER_SNAKE = 400
+
+
+def arena_side(snakes):
+    return max(1, int(math.sqrt(snakes * CELLS_PER_SNAKE)))
+
+
+class ArenaSnake:
+    __slots__ = ('index', 'body', 'direction', 'alive', 'player', 'target', 'deaths', 'best')
+
+    def __init__(self, index, player=False):
+        self.index = index
+        self.body = deque()
+        self.direction = 'Right'
+        self.alive = False
+        self.player = player
+        self.target = None
+        self.deaths = 0
+        self.best = 0
+
+    def __len__(self):
+        return len(self.body)
+
+    @property
+    def head(self):
+        return self.body[0]
+
+
+def greedy_policy(arena, snake):
+    if snake.target not in arena.food:
+        snake.target = arena.rng.choice(arena.food_list) if arena.food_list else None
+    return greedy_move(snake.head, snake.direction, snake.target, arena.is_free)
+
+
+class Arena:
+    def __init__(self, columns, rows, snakes, players=0, food=None, respawn=True, policy=greedy_policy, rng=None,
+                 track_changes=False):
+        self.columns = columns
+        self.rows = rows
+        self.respawn = respawn
+        self.policy = policy
+        self.rng = rng if rng is not None else random.Random()
+        self.food_target = food if food is not None else snakes * FOOD_PER_SNAKE
+        self.occupied = {}
+        self.food = {}
+        self.food_list = []
+        self.dirty = [] if track_changes else None
+        self.ticks = 0
+        self.snakes = [ArenaSnake(index, player=index < players) for index in range(snakes)]
+        self.waiting = []
+        for snake in self.snakes:
+            if not self.spawn(snake):
+                self.waiting.append(snake)
+        self.fill_food()
+
+    def is_free(self, cell):
+        x, y = cell
+        return 0 <= x < self.columns and 0 <= y < self.rows and cell not in self.occupied
+
+    def random_free_cell(self):
+        randrange = self.rng.randrange
+        for _ in range(SPAWN_ATTEMPTS):
+            cell = (randrange(self.columns), randrange(self.rows))
+            if cell not in self.occupied and cell not in self.food:
+                return cell
+        return None
+
+    def spawn(self, snake):
+        cell = self.random_free_cell()
+        if cell is None:
+            return False
+        snake.body.clear()
+        snake.body.append(cell)
+        snake.direction = self.rng.choice(list(DIRECTIONS))
+        snake.alive = True
+        snake.target = None
+        self.occupied[cell] = snake.index
+        if self.dirty is not None:
+            self.dirty.append(cell)
+        return True
+
+    def add_food(self, cell):
+        self.food[cell] = len(self.food_list)
+        self.food_list.append(cell)
+        if self.dirty is not None:
+            self.dirty.append(cell)
+
+    def remove_food(self, cell):
+        if self.dirty is not None:
+            self.dirty.append(cell)
+        i = self.food.pop(cell)
+        last = self.food_list.pop()
+        if i < len(self.food_list):
+            self.food_list[i] = last
+            self.food[last] = i
+
+    def fill_food(self):
+        while len(self.food_list) < self.food_target:
+            cell = self.random_free_cell()
+            if cell is None:
+                return
+            self.add_food(cell)
+
+    def kill(self, snake):
+        snake.alive = False
+        snake.deaths += 1
+        occupied = self.occupied
+        for cell in snake.body:
+            if occupied.get(cell) == snake.index:
+                del occupied[cell]
+        if self.dirty is not None:
+            self.dirty.extend(snake.body)
+        snake.body.clear()
+
+    def changes(self):
+        dirty = self.dirty
+        self.dirty = []
+        return dirty
+
+    def step(self, actions=None):
+        self.ticks += 1
+        occupied = self.occupied
+        dirty = self.dirty
+        moves = []
+        heads = {}
+        for snake in self.snakes:
+            if not snake.alive:
+                continue
+            if snake.player:
+                action = actions.get(snake.index) if actions else None
+            else:
+                action = self.policy(self, snake)
+            if action is not None and action != OPPOSITES[snake.direction]:
+                snake.direction = action
+            dx, dy = DIRECTIONS[snake.direction]
+            x, y = snake.body[0]
+            head = (x + dx, y + dy)
+            ate = head in self.food
+            if not ate:
+                tail = snake.body.pop()
+                del occupied[tail]
+                if dirty is not None:
+                    dirty.append(tail)
+            moves.append((snake, head, ate))
+            heads[head] = heads.get(head, 0) + 1
+
+        dead = []
+        for snake, head, ate in moves:
+            x, y = head
+            if (heads[head] > 1 or head in occupied
+                    or x < 0 or x >= self.columns or y < 0 or y >= self.rows):
+                dead.append(snake)
+                continue
+            snake.body.appendleft(head)
+            occupied[head] = snake.index
+            if dirty is not None:
+                dirty.append(head)
+            if ate:
+                self.remove_food(head)
+                snake.best = max(snake.best, len(snake.body))
+
+        for snake in dead:
+            self.kill(snake)
+        if self.respawn:
+            self.waiting.extend(snake for snake in dead if not snake.player)
+        if self.waiting:
+            self.waiting = [snake for snake in self.waiting if not self.spawn(snake)]
+        self.fill_food()
+        return dead
+
+    def alive_count(self):
+        return sum(snake.alive for snake in self.snakes)
+
+    def segments(self):
+        return len(self.occupied)
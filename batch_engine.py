@@ -0,0 +1,121 @@
+import numpy as np
+
+from Snake import DIRECTIONS
+
+ACTIONS = ('Left', 'Right', 'Up', 'Down')
+NO_ACTION = -1
+ACTION_DX = np.array([DIRECTIONS[action][0] for action in ACTIONS], dtype=np.int64)
+ACTION_DY = np.array([DIRECTIONS[action][1] for action in ACTIONS], dtype=np.int64)
+OPPOSITE_ACTIONS = np.array([1, 0, 3, 2], dtype=np.int64)
+FOOD_ATTEMPTS = 8
+
+
+class BatchEngine:
+    def __init__(self, games, columns, rows, start=(1, 1), seed=None):
+        self.games = games
+        self.columns = columns
+        self.rows = rows
+        self.cells = columns * rows
+        self.start = start[1] * columns + start[0]
+        self.rng = np.random.default_rng(seed)
+
+        cell_dtype = np.int16 if self.cells <= np.iinfo(np.int16).max else np.int32
+        self.body = np.zeros((games, self.cells), dtype=cell_dtype)
+        self.occupied = np.zeros((games, self.cells), dtype=bool)
+        self.head_ptr = np.zeros(games, dtype=np.int64)
+        self.length = np.zeros(games, dtype=np.int64)
+        self.food = np.full(games, -1, dtype=np.int64)
+        self.direction = np.zeros(games, dtype=np.int64)
+        self.ticks = np.zeros(games, dtype=np.int64)
+        self.alive = np.zeros(games, dtype=bool)
+        self.won = np.zeros(games, dtype=bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        games = np.arange(self.games) if mask is None else np.flatnonzero(mask)
+        if not games.size:
+            return games
+        self.occupied[games] = False
+        self.occupied[games, self.start] = True
+        self.body[games, 0] = self.start
+        self.head_ptr[games] = 0
+        self.length[games] = 1
+        self.direction[games] = ACTIONS.index('Right')
+        self.ticks[games] = 0
+        self.alive[games] = True
+        self.won[games] = False
+        self.place_food(games)
+        return games
+
+    def heads(self, games=None):
+        if games is None:
+            games = np.arange(self.games)
+        return self.body[games, self.head_ptr[games]].astype(np.int64)
+
+    def snake_cells(self, game):
+        ptrs = (self.head_ptr[game] - np.arange(self.length[game])) % self.cells
+        cells = self.body[game, ptrs].astype(np.int64)
+        return list(zip((cells % self.columns).tolist(), (cells // self.columns).tolist()))
+
+    def step(self, actions=None):
+        ate_mask = np.zeros(self.games, dtype=bool)
+        games = np.flatnonzero(self.alive)
+        if not games.size:
+            return ate_mask
+
+        if actions is not None:
+            requested = np.asarray(actions, dtype=np.int64)[games]
+            valid = (requested != NO_ACTION) & (requested != OPPOSITE_ACTIONS[self.direction[games]])
+            self.direction[games[valid]] = requested[valid]
+
+        direction = self.direction[games]
+        head = self.heads(games)
+        x = head % self.columns + ACTION_DX[direction]
+        y = head // self.columns + ACTION_DY[direction]
+        self.ticks[games] += 1
+
+        inside = (x >= 0) & (x < self.columns) & (y >= 0) & (y < self.rows)
+        self.alive[games[~inside]] = False
+        games = games[inside]
+        new_head = y[inside] * self.columns + x[inside]
+
+        ate = new_head == self.food[games]
+        movers = games[~ate]
+        tail_ptr = (self.head_ptr[movers] - self.length[movers] + 1) % self.cells
+        self.occupied[movers, self.body[movers, tail_ptr]] = False
+
+        collided = self.occupied[games, new_head]
+        self.alive[games[collided]] = False
+        survivors = games[~collided]
+        new_head = new_head[~collided]
+        ate = ate[~collided]
+
+        head_ptr = (self.head_ptr[survivors] + 1) % self.cells
+        self.head_ptr[survivors] = head_ptr
+        self.body[survivors, head_ptr] = new_head
+        self.occupied[survivors, new_head] = True
+
+        eaters = survivors[ate]
+        self.length[eaters] += 1
+        ate_mask[eaters] = True
+        self.place_food(eaters)
+        return ate_mask
+
+    def place_food(self, games):
+        full = self.length[games] >= self.cells
+        self.food[games[full]] = -1
+        self.won[games[full]] = True
+        self.alive[games[full]] = False
+
+        pending = games[~full]
+        for _ in range(FOOD_ATTEMPTS):
+            if not pending.size:
+                return
+            candidates = self.rng.integers(0, self.cells, size=pending.size)
+            free = ~self.occupied[pending, candidates]
+            self.food[pending[free]] = candidates[free]
+            pending = pending[~free]
+
+        for game in pending:
+            free_cells = np.flatnonzero(~self.occupied[game])
+            self.food[game] = free_cells[self.rng.integers(free_cells.size)]
@@ -0,0 +1,58 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arena import Arena, arena_side
+
+SNAKE_COUNTS = (10, 100, 1000)
+TICKS = 500
+WARMUP = 200
+
+
+def build(snakes, seed=0):
+    side = arena_side(snakes)
+    arena = Arena(side, side, snakes, rng=random.Random(seed))
+    for _ in range(WARMUP):
+        arena.step()
+    return arena
+
+
+def hashed_rate(snakes):
+    arena = build(snakes)
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        arena.step()
+    return (time.perf_counter() - start) / TICKS, arena.segments()
+
+
+def naive_check(arena):
+    segments = [cell for snake in arena.snakes if snake.alive for cell in snake.body]
+    hits = 0
+    for snake in arena.snakes:
+        if snake.alive:
+            head = snake.body[0]
+            hits += segments.count(head) > 1
+    return hits
+
+
+def naive_rate(snakes, ticks):
+    arena = build(snakes)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        naive_check(arena)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    print(f'{"snakes":>7} {"segments":>9} {"tick":>11} {"per snake":>11} {"naive collisions":>17}')
+    for snakes in SNAKE_COUNTS:
+        tick, segments = hashed_rate(snakes)
+        naive = naive_rate(snakes, max(1, 10000 // snakes))
+        print(f'{snakes:>7} {segments:>9} {tick * 1000:>8.3f} ms {tick / snakes * 1e6:>8.2f} us {naive * 1000:>14.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import SPEED_OPTIONS, Engine, GameTheme, PathPlanner, RollingHistogram, default_game_theme
+
+BOARDS = (20, 40)
+DECISIONS = 5000
+BUDGET = SPEED_OPTIONS['Medium'] / 2000
+
+
+def run(columns, rows, decisions, seed=0):
+    engine = Engine(columns, rows, rng=random.Random(seed))
+    planner = PathPlanner(columns, rows)
+    latency = RollingHistogram(decisions)
+    games = 0
+    best = 0
+    start = time.perf_counter()
+    for _ in range(decisions):
+        state = engine.state
+        began = time.perf_counter()
+        move = planner.decide(tuple(state.snake), state.food, began + BUDGET)
+        latency.add(time.perf_counter() - began)
+        engine.step(move)
+        best = max(best, len(engine.state.snake))
+        if not engine.state.alive:
+            games += 1
+            engine.reset()
+            planner = PathPlanner(columns, rows)
+    elapsed = time.perf_counter() - start
+    return decisions / elapsed, latency.percentiles(50, 99), planner, games, best
+
+
+def main():
+    theme = GameTheme(default_game_theme)
+    boards = sorted(set(BOARDS) | {theme.columns})
+    print(f'{"board":>7} {"decisions/s":>12} {"p50":>9} {"p99":>9} {"reused":>7} {"timeouts":>9} {"games":>6} {"best":>5}')
+    for size in boards:
+        rate, (p50, p99), planner, games, best = run(size, size, DECISIONS)
+        reused = planner.reused / max(1, planner.reused + planner.searches)
+        print(f'{size:>3}x{size:<3} {rate:>12,.0f} {p50 * 1000:>6.2f} ms {p99 * 1000:>6.2f} ms {reused:>6.0%} '
+              f'{planner.timeouts:>9} {games:>6} {best:>5}')
+
+
+if __name__ == '__main__':
+    main()
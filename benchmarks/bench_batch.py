@@ -0,0 +1,54 @@
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import Engine
+from batch_engine import ACTIONS, NO_ACTION, BatchEngine
+
+COLUMNS = 40
+ROWS = 40
+BATCH_SIZES = (100, 1000, 10000)
+STEPS = 200
+TURN_PROBABILITY = 0.2
+
+
+def scalar_rate(games, steps):
+    rng = random.Random(0)
+    engines = [Engine(COLUMNS, ROWS, rng=random.Random(seed)) for seed in range(games)]
+    start = time.perf_counter()
+    for _ in range(steps):
+        for engine in engines:
+            action = rng.choice(ACTIONS) if rng.random() < TURN_PROBABILITY else None
+            engine.step(action)
+            if not engine.state.alive:
+                engine.reset()
+    return games * steps / (time.perf_counter() - start)
+
+
+def batch_rate(games, steps):
+    rng = np.random.default_rng(0)
+    engine = BatchEngine(games, COLUMNS, ROWS, seed=0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        actions = rng.integers(0, len(ACTIONS), size=games)
+        actions[rng.random(games) >= TURN_PROBABILITY] = NO_ACTION
+        engine.step(actions)
+        engine.reset(~engine.alive)
+    return games * steps / (time.perf_counter() - start)
+
+
+def main():
+    print(f'{"games":>7} {"scalar steps/s":>16} {"batch steps/s":>16} {"speedup":>9}')
+    for games in BATCH_SIZES:
+        scalar = scalar_rate(min(games, 1000), STEPS)
+        batch = batch_rate(games, STEPS)
+        print(f'{games:>7} {scalar:>16,.0f} {batch:>16,.0f} {batch / scalar:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
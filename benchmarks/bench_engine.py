@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import DIRECTIONS, Engine
+
+COLUMNS = 40
+ROWS = 40
+TICKS = 1_000_000
+
+
+def policy(state, rng):
+    x, y = state.snake.head
+    direction = state.direction
+    dx, dy = DIRECTIONS[direction]
+    nx, ny = x + dx, y + dy
+    if 0 <= nx < state.columns and 0 <= ny < state.rows and (nx, ny) not in state.snake and rng.random() > 0.1:
+        return None
+    choices = [d for d, (dx, dy) in DIRECTIONS.items()
+               if 0 <= x + dx < state.columns and 0 <= y + dy < state.rows and (x + dx, y + dy) not in state.snake]
+    return rng.choice(choices) if choices else None
+
+
+def record_actions(ticks):
+    rng = random.Random(0)
+    engine = Engine(COLUMNS, ROWS, rng=random.Random(0))
+    actions = []
+    start = time.perf_counter()
+    for _ in range(ticks):
+        action = policy(engine.state, rng)
+        actions.append(action)
+        engine.step(action)
+        if not engine.state.alive:
+            engine.reset()
+    return actions, time.perf_counter() - start
+
+
+def replay_actions(actions):
+    engine = Engine(COLUMNS, ROWS, rng=random.Random(0))
+    step = engine.step
+    state = engine.state
+    games = 1
+    start = time.perf_counter()
+    for action in actions:
+        step(action)
+        if not state.alive:
+            state = engine.reset()
+            games += 1
+    return time.perf_counter() - start, games
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else TICKS
+    actions, with_policy = record_actions(ticks)
+    engine_only, games = replay_actions(actions)
+    print(f'{ticks:,} ticks, {games:,} games on {COLUMNS}x{ROWS}')
+    print(f'engine only:  {ticks / engine_only:>12,.0f} ticks/s')
+    print(f'with policy:  {ticks / with_policy:>12,.0f} ticks/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import PackedSnakeBody, SnakeBody
+from common import serpentine
+
+COLUMNS = 2000
+ROWS = 1000
+SEGMENTS = (10000, 100000, 1000000)
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    body = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del body
+    return size
+
+
+def build_tuples(count):
+    body = SnakeBody()
+    for cell in serpentine(count, COLUMNS):
+        body.push_head(cell)
+    return body
+
+
+def build_packed(count):
+    body = PackedSnakeBody(COLUMNS, ROWS)
+    for cell in serpentine(count, COLUMNS):
+        body.push_head(cell)
+    return body
+
+
+def main():
+    bitmap = (COLUMNS * ROWS + 7) // 8
+    print(f'board {COLUMNS}x{ROWS}, occupancy bitmap {bitmap / 1024:,.0f} KiB')
+    print(f'{"segments":>10} {"tuples":>14} {"packed":>14} {"packed - bitmap":>16} {"saving":>8}')
+    for count in SEGMENTS:
+        tuples = measure(lambda: build_tuples(count))
+        packed = measure(lambda: build_packed(count))
+        print(f'{count:>10,} {tuples / count:>10.1f} B/seg {packed / count:>10.1f} B/seg '
+              f'{(packed - bitmap) / count:>12.1f} B/seg {tuples / packed:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import tkinter as tk
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import RasterRenderer, SnakeRenderer
+from common import serpentine
+
+SIZE = 20
+LENGTHS = (100, 1000, 10000)
+TICKS = 200
+COLUMNS = 200
+
+
+def run(canvas, length, incremental, raster=False):
+    path = list(serpentine(length + TICKS, COLUMNS))
+    snake = deque(reversed(path[:length]))
+    if raster:
+        renderer = RasterRenderer(canvas, SIZE, '#00FF00', COLUMNS, len(path) // COLUMNS + 1)
+    else:
+        renderer = SnakeRenderer(canvas, SIZE, '#00FF00')
+    renderer.redraw(snake)
+    canvas.update_idletasks()
+
+    start = time.perf_counter()
+    for cell in path[length:]:
+        snake.appendleft(cell)
+        snake.pop()
+        if incremental:
+            renderer.render(snake)
+        else:
+            renderer.redraw(snake)
+        canvas.update_idletasks()
+    elapsed = time.perf_counter() - start
+    renderer.reset()
+    return elapsed / TICKS
+
+
+def main():
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width=800, height=800, background='black')
+    canvas.pack()
+    print(f'{"length":>8} {"full redraw":>14} {"incremental":>14} {"raster":>14} {"speedup":>9}')
+    for length in LENGTHS:
+        full = run(canvas, length, incremental=False)
+        incremental = run(canvas, length, incremental=True)
+        raster = run(canvas, length, incremental=True, raster=True)
+        print(f'{length:>8} {full * 1000:>11.3f} ms {incremental * 1000:>11.3f} ms {raster * 1000:>11.3f} ms '
+              f'{full / incremental:>8.1f}x')
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
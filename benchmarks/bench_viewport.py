@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import tkinter as tk
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import ViewportRenderer
+from common import serpentine
+
+SIZE = 20
+VIEW = 40
+WORLDS = (200, 1000, 10000)
+LENGTHS = (100, 10000)
+TICKS = 2000
+
+
+def run(canvas, world, length):
+    path = list(serpentine(length + TICKS, world))
+    snake = deque(reversed(path[:length]))
+    renderer = ViewportRenderer(canvas, SIZE, '#00FF00', world, world, VIEW, VIEW)
+    renderer.redraw(snake)
+    canvas.update_idletasks()
+
+    start = time.perf_counter()
+    for cell in path[length:]:
+        snake.appendleft(cell)
+        snake.pop()
+        renderer.render(snake)
+        canvas.update_idletasks()
+    elapsed = time.perf_counter() - start
+    items = len(canvas.find_withtag(renderer.tag))
+    renderer.reset()
+    return elapsed / TICKS, items
+
+
+def main():
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width=VIEW * SIZE, height=VIEW * SIZE, background='black')
+    canvas.pack()
+    print(f'{"world":>12} {"length":>8} {"per frame":>12} {"items":>7}')
+    for world in WORLDS:
+        for length in LENGTHS:
+            if length >= world * world:
+                continue
+            per_frame, items = run(canvas, world, length)
+            print(f'{world:>5}x{world:<6} {length:>8} {per_frame * 1000:>9.3f} ms {items:>7}')
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+def serpentine(count, columns):
+    for i in range(count):
+        row, col = divmod(i, columns)
+        if row % 2:
+            col = columns - 1 - col
+        yield col, row
@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import DIRECTIONS, Engine, FreeCells, GameTheme, RasterRenderer, ScoreStore, SnakeBody, SnakeRenderer, game_themes
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = os.path.join(BENCHMARK_DIR, 'results.json')
+SCORE_TABLE_SIZES = (10, 1000, 100000)
+
+
+def board_cycle(columns, rows):
+    if rows % 2 and columns % 2 == 0:
+        return [(x, y) for y, x in board_cycle(rows, columns)]
+    if rows % 2 or columns < 2:
+        return None
+    cycle = [(0, 0)]
+    for y in range(rows):
+        xs = range(1, columns) if y % 2 == 0 else range(columns - 1, 0, -1)
+        cycle.extend((x, y) for x in xs)
+    cycle.extend((0, y) for y in range(rows - 1, 0, -1))
+    return cycle
+
+
+def snake_lengths(cells):
+    return sorted({length for length in (1, cells // 100, cells // 10, cells // 2, cells - 1, cells) if length >= 1})
+
+
+def build_engine(columns, rows, cycle, length, seed):
+    engine = Engine(columns, rows, rng=random.Random(seed))
+    state = engine.state
+    state.free_cells = FreeCells((x, y) for y in range(rows) for x in range(columns))
+    state.snake = SnakeBody(reversed(cycle[:length]), free_cells=state.free_cells)
+    state.food = None
+    state.direction = direction_between(cycle[length - 1], cycle[length % len(cycle)])
+    return engine
+
+
+def direction_between(cell, next_cell):
+    offset = (next_cell[0] - cell[0], next_cell[1] - cell[1])
+    return next(direction for direction, delta in DIRECTIONS.items() if delta == offset)
+
+
+def next_directions(cycle):
+    return {cell: direction_between(cell, cycle[(i + 1) % len(cycle)]) for i, cell in enumerate(cycle)}
+
+
+def measure(function, ops, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        setup = function()
+        start = time.perf_counter()
+        setup(ops)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_move_snake(columns, rows, cycle, length, seed):
+    directions = next_directions(cycle)
+
+    def setup():
+        engine = build_engine(columns, rows, cycle, length, seed)
+        state = engine.state
+
+        def run(ops):
+            step = engine.step
+            for _ in range(ops):
+                step(directions[state.snake.head])
+        return run
+    return setup
+
+
+def bench_check_collision(columns, rows, cycle, length, seed):
+    def setup():
+        snake = build_engine(columns, rows, cycle, length, seed).state.snake
+
+        def run(ops):
+            head_collides = snake.head_collides
+            for _ in range(ops):
+                head_collides()
+        return run
+    return setup
+
+
+def bench_create_food(columns, rows, cycle, length, seed):
+    def setup():
+        engine = build_engine(columns, rows, cycle, length, seed)
+
+        def run(ops):
+            create_food = engine.create_food
+            for _ in range(ops):
+                create_food()
+        return run
+    return setup
+
+
+def bench_render_snake(canvas, size, columns, rows, cycle, length, seed, raster=False):
+    directions = next_directions(cycle)
+
+    def setup():
+        engine = build_engine(columns, rows, cycle, length, seed)
+        if raster:
+            renderer = RasterRenderer(canvas, size, '#00FF00', columns, rows)
+        else:
+            renderer = SnakeRenderer(canvas, size, '#00FF00')
+        renderer.redraw(engine.state.snake)
+
+        def run(ops):
+            state = engine.state
+            for _ in range(ops):
+                engine.step(directions[state.snake.head])
+                renderer.render(state.snake)
+            canvas.update_idletasks()
+        return run
+    return setup
+
+
+def bench_check_high_score(directory, table_size, seed):
+    def setup():
+        rng = random.Random(seed)
+        path = os.path.join(directory, f'scores-{table_size}.sqlite3')
+        if os.path.exists(path):
+            os.remove(path)
+        store = ScoreStore(path)
+        with store.connection:
+            store.connection.executemany(
+                'INSERT INTO games (difficulty, name, score, duration, timestamp) VALUES (?, ?, ?, ?, ?)',
+                (('Medium', 'player', rng.randrange(1, 1000), rng.randrange(600), time.time()) for _ in range(table_size)))
+
+        def run(ops):
+            for i in range(ops):
+                score = rng.randrange(1, 1000)
+                name = 'player' if store.qualifies('Medium', score) else ''
+                store.record('Medium', name, score, i, time.time())
+            store.close()
+        return run
+    return setup
+
+
+def open_canvas():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as error:
+        print(f'render_snake skipped: {error}')
+        return None, None
+    canvas = tk.Canvas(root, width=800, height=800, background='black')
+    canvas.pack()
+    return root, canvas
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args):
+    results = []
+    root, canvas = (None, None) if args.no_render else open_canvas()
+
+    def record(case, ops, seconds, **params):
+        result = dict(case=case, ops=ops, seconds=seconds, ns_per_op=seconds / ops * 1e9, **params)
+        results.append(result)
+        label = ' '.join(f'{key}={value}' for key, value in params.items())
+        print(f'{case:<18} {label:<52} {result["ns_per_op"]:>14,.0f} ns/op')
+
+    for theme_name in args.themes or list(game_themes):
+        theme = GameTheme(game_themes[theme_name])
+        size, columns, rows = theme.snake_size, theme.columns, theme.rows
+        cycle = board_cycle(columns, rows)
+        if cycle is None:
+            print(f'{theme_name}: {columns}x{rows} board has no Hamiltonian cycle, skipped')
+            continue
+
+        for length in snake_lengths(columns * rows):
+            params = dict(theme=theme_name, board=f'{columns}x{rows}', length=length)
+            record('move_snake', args.ops, measure(bench_move_snake(columns, rows, cycle, length, args.seed), args.ops, args.repeat), **params)
+            record('check_collision', args.ops, measure(bench_check_collision(columns, rows, cycle, length, args.seed), args.ops, args.repeat), **params)
+            record('create_food', args.ops, measure(bench_create_food(columns, rows, cycle, length, args.seed), args.ops, args.repeat), **params)
+            if canvas is not None:
+                record('render_snake', args.ops, measure(bench_render_snake(canvas, size, columns, rows, cycle, length, args.seed), args.ops, args.repeat), **params)
+                record('render_raster', args.ops, measure(bench_render_snake(canvas, size, columns, rows, cycle, length, args.seed, raster=True), args.ops, args.repeat), **params)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for table_size in SCORE_TABLE_SIZES:
+            record('check_high_score', args.ops, measure(bench_check_high_score(directory, table_size, args.seed), args.ops, args.repeat), scores=table_size)
+
+    if root is not None:
+        root.destroy()
+    return results
+
+
+def load_results(path):
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {'runs': []}
+
+
+def compare(previous, results):
+    key = lambda result: (result['case'],) + tuple(sorted((k, str(v)) for k, v in result.items() if k not in ('ops', 'seconds', 'ns_per_op')))
+    before = {key(result): result for result in previous['results']}
+    print(f'\nCompared with {previous["commit"]} ({previous["date"]}):')
+    for result in results:
+        old = before.get(key(result))
+        if old:
+            print(f'{result["case"]:<18} {old["ns_per_op"]:>14,.0f} -> {result["ns_per_op"]:>14,.0f} ns/op '
+                  f'({old["ns_per_op"] / result["ns_per_op"]:.2f}x)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the game hot paths across board sizes and snake lengths.')
+    parser.add_argument('--themes', nargs='*', help='game themes to benchmark (default: all in game_themes.json)')
+    parser.add_argument('--ops', type=int, default=2000, help='operations per measurement')
+    parser.add_argument('--repeat', type=int, default=5, help='measurements per case; the fastest is kept')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-render', action='store_true', help='skip render_snake (it needs a display)')
+    parser.add_argument('--output', default=RESULTS_FILE, help='JSON history to compare with and append to (kept out of git)')
+    args = parser.parse_args()
+
+    results = run_suite(args)
+
+    history = load_results(args.output)
+    if history['runs']:
+        compare(history['runs'][-1], results)
+    history['runs'].append({
+        'commit': git_commit(),
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'ops': args.ops,
+        'repeat': args.repeat,
+        'results': results,
+    })
+    with open(args.output, 'w') as file:
+        json.dump(history, file, indent=4)
+    print(f'\nResults appended to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import DIRECTIONS, Engine
+
+
+def play(seed, ticks=500):
+    engine = Engine(10, 10, start=(1, 1), rng=random.Random(seed))
+    moves = random.Random(seed + 1)
+    trace = []
+    for _ in range(ticks):
+        if not engine.state.alive:
+            break
+        engine.step(moves.choice(list(DIRECTIONS)) if moves.random() < 0.3 else None)
+        trace.append((engine.state.snake.head, engine.state.food, len(engine.state.snake)))
+    return trace
+
+
+def test_same_seed_plays_the_same_game():
+    assert play(3) == play(3)
+    assert play(3) != play(4)
+
+
+def test_eating_grows_the_snake_and_places_new_food():
+    engine = Engine(10, 1, start=(0, 0), rng=random.Random(0))
+    state = engine.state
+    state.food = (1, 0)
+    assert engine.step('Right')
+    assert len(state.snake) == 2
+    assert state.food not in state.snake
+
+
+def test_reversal_is_ignored_and_walls_kill():
+    engine = Engine(3, 3, start=(1, 1), rng=random.Random(0))
+    engine.state.food = (0, 0)
+    engine.step('Left')
+    assert engine.state.snake.head == (2, 1)
+    assert engine.state.alive
+    engine.step()
+    assert not engine.state.alive
+
+
+def test_filling_the_board_wins():
+    engine = Engine(2, 1, start=(0, 0), rng=random.Random(0))
+    assert engine.state.food == (1, 0)
+    engine.step('Right')
+    assert engine.state.won and not engine.state.alive
@@ -0,0 +1,46 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import FreeCells, SnakeBody
+
+
+def board(columns, rows):
+    return FreeCells((x, y) for y in range(rows) for x in range(columns))
+
+
+def test_discard_and_add_keep_the_index_consistent():
+    free = board(4, 4)
+    rng = random.Random(0)
+    removed = set()
+    for _ in range(200):
+        cell = (rng.randrange(4), rng.randrange(4))
+        if cell in removed:
+            free.add(cell)
+            removed.discard(cell)
+        else:
+            free.discard(cell)
+            removed.add(cell)
+        assert len(free) == 16 - len(removed)
+        assert all(free.cells[i] == cell for cell, i in free.index.items())
+        assert set(free.cells).isdisjoint(removed)
+
+
+def test_choice_is_seeded_and_empty_board_has_no_choice():
+    assert board(5, 5).choice(random.Random(7)) == board(5, 5).choice(random.Random(7))
+    free = board(1, 2)
+    free.discard((0, 0))
+    free.discard((0, 1))
+    assert free.choice(random.Random(0)) is None
+
+
+def test_snake_body_keeps_free_cells_in_sync():
+    free = board(3, 3)
+    snake = SnakeBody([(1, 1)], free_cells=free)
+    snake.push_head((2, 1))
+    snake.pop_tail()
+    snake.push_head((2, 2))
+    assert set(snake) == {(2, 1), (2, 2)}
+    assert set(free.cells) == {(x, y) for x in range(3) for y in range(3)} - set(snake)
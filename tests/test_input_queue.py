@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import InputQueue
+
+
+def test_same_and_opposite_turns_are_dropped():
+    inputs = InputQueue()
+    assert not inputs.push('Right', 'Right', 1.0)
+    assert not inputs.push('Left', 'Right', 1.0)
+    assert inputs.push('Up', 'Right', 1.0)
+    assert not inputs.push('Down', 'Right', 2.0)
+    assert inputs.push('Left', 'Right', 2.0)
+    assert [inputs.pop(), inputs.pop(), inputs.pop()] == [('Up', 1.0), ('Left', 2.0), (None, None)]
+
+
+def test_a_full_queue_replaces_its_last_turn():
+    inputs = InputQueue(maxlen=2)
+    inputs.push('Up', 'Right', 1.0)
+    inputs.push('Left', 'Right', 2.0)
+    assert inputs.push('Right', 'Right', 3.0)
+    assert not inputs.push('Down', 'Right', 4.0)
+    assert len(inputs) == 2
+    assert [inputs.pop(), inputs.pop()] == [('Up', 1.0), ('Right', 3.0)]
+
+
+def test_restamp_moves_every_turn_to_the_new_time():
+    inputs = InputQueue()
+    inputs.push('Up', 'Right', 1.0)
+    inputs.push('Left', 'Right', 2.0)
+    inputs.restamp(5.0)
+    assert [inputs.pop(), inputs.pop()] == [('Up', 5.0), ('Left', 5.0)]
@@ -0,0 +1,63 @@
+import json
+import os
+import stat
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import Persister, ScoreStore, write_json_atomic
+
+
+def wait_idle(persister, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not persister.idle():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_atomic_write_replaces_contents_and_keeps_the_mode(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text('{}')
+    os.chmod(path, 0o600)
+    write_json_atomic(str(path), {'speed': 'Fast'})
+    assert json.loads(path.read_text()) == {'speed': 'Fast'}
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert os.listdir(tmp_path) == ['settings.json']
+
+
+def test_persister_keeps_only_the_latest_save_per_path(tmp_path):
+    path = str(tmp_path / 'themes.json')
+    persister = Persister(delay=0.05)
+    data = {'count': 0}
+    for count in range(1, 6):
+        data['count'] = count
+        persister.save_json(path, data)
+    data['count'] = 99
+    wait_idle(persister)
+    persister.close()
+    with open(path) as file:
+        assert json.load(file) == {'count': 5}
+
+
+def test_staged_scores_rank_before_they_are_written(tmp_path):
+    store = ScoreStore(str(tmp_path / 'scores.sqlite3'))
+    store.record('Normal', 'saved', 5, 10, 0.0)
+    entry = ('Normal', 'staged', 5, 12, 1.0, '')
+    staged = store.stage(*entry)
+    assert [row[2] for row in store.top('Normal')] == ['saved', 'staged']
+    assert store.count('Normal') == 2
+    assert not store.qualifies('Normal', 5, limit=2)
+
+    store.record(*entry, staged=staged)
+    assert store.pending == []
+    assert [row[2] for row in store.top('Normal')] == ['saved', 'staged']
+
+
+def test_unstaged_scores_are_never_written(tmp_path):
+    store = ScoreStore(str(tmp_path / 'scores.sqlite3'))
+    entry = ('Normal', 'gone', 7, 10, 0.0, '')
+    staged = store.stage(*entry)
+    store.unstage({staged[0]})
+    assert store.record(*entry, staged=staged) is None
+    assert store.count('Normal') == 0
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import ReplayRecorder, decode_varints, encode_varint, load_replay
+
+
+@pytest.mark.parametrize('value', [0, 1, 127, 128, 300, 1 << 20, (1 << 35) + 5])
+def test_varint_round_trip(value):
+    out = bytearray()
+    encode_varint(value, out)
+    assert list(decode_varints(out)) == [value]
+
+
+def test_recorded_events_load_back(tmp_path):
+    path = str(tmp_path / 'game.snkr')
+    recorder = ReplayRecorder(path, 0xDEADBEEF, 100, 40, 30, 20, (1, 2), flush_bytes=8)
+    events = [(3, 'Up'), (4, 'Left'), (200, 'Down'), (70000, 'Right')]
+    for tick, action in events:
+        recorder.record(tick, action)
+    recorder.close(70010, 12)
+    recorder.wait(timeout=5)
+
+    replay = load_replay(path)
+    assert (replay.seed, replay.interval_ms, replay.columns, replay.rows, replay.snake_size, replay.start) == \
+        (0xDEADBEEF, 100, 40, 30, 20, (1, 2))
+    assert replay.events == events
+    assert replay.complete and (replay.ticks, replay.length) == (70010, 12)
+
+
+def test_unfinished_recording_loads_as_incomplete(tmp_path):
+    path = str(tmp_path / 'crashed.snkr')
+    recorder = ReplayRecorder(path, 1, 100, 10, 10, 20, (1, 1))
+    recorder.record(5, 'Down')
+    recorder.flush()
+    recorder.chunks.put(None)
+    recorder.wait(timeout=5)
+    replay = load_replay(path)
+    assert replay.events == [(5, 'Down')]
+    assert not replay.complete
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'notes.snkr'
+    path.write_bytes(b'not a replay at all, just some text')
+    with pytest.raises(ValueError):
+        load_replay(str(path))
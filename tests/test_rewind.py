@@ -0,0 +1,86 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import DIRECTIONS, Engine, FreeCells, ReplayRecorder, load_replay, simulate_replay
+
+
+def snapshot(engine):
+    state = engine.state
+    return (list(state.snake), dict(state.snake.occupied), list(state.free_cells.cells), state.food,
+            state.direction, state.ticks, state.alive, state.won, engine.rng.getstate())
+
+
+def random_actions(seed, count):
+    moves = random.Random(seed)
+    return [moves.choice(list(DIRECTIONS)) if moves.random() < 0.3 else None for _ in range(count)]
+
+
+def test_free_cells_restore_undoes_discard():
+    cells = FreeCells(range(6))
+    before = list(cells.cells)
+    undo = [(cell, cells.discard(cell)) for cell in (2, 0, 5, 3)]
+    for cell, i in reversed(undo):
+        cells.restore(cell, i)
+    assert cells.cells == before
+    assert cells.index == {cell: i for i, cell in enumerate(before)}
+
+
+def test_rewind_then_restep_gives_an_identical_state():
+    for seed in range(20):
+        engine = Engine(8, 8, start=(1, 1), rng=random.Random(seed), history=100)
+        actions = random_actions(seed + 100, 60)
+        states = [snapshot(engine)]
+        for action in actions:
+            engine.step(action)
+            states.append(snapshot(engine))
+            if not engine.state.alive:
+                break
+
+        played = len(states) - 1
+        back = min(played, 25)
+        assert engine.rewind(back) == back
+        assert snapshot(engine) == states[played - back]
+        for action in actions[played - back:played]:
+            engine.step(action)
+        assert snapshot(engine) == states[played]
+
+
+def test_rewind_is_bounded_by_the_history():
+    engine = Engine(8, 8, start=(1, 1), rng=random.Random(1), history=3)
+    for _ in range(5):
+        engine.step('Down')
+    assert engine.rewind(10) == 3
+    assert engine.state.ticks == 2
+    assert engine.rewind(1) == 0
+
+
+def test_an_engine_without_history_cannot_rewind():
+    engine = Engine(8, 8, start=(1, 1), rng=random.Random(1))
+    engine.step()
+    assert engine.history is None
+    assert engine.rewind(1) == 0
+    assert engine.state.ticks == 1
+
+
+def test_replays_with_rewinds_simulate_exactly(tmp_path):
+    seed = 7
+    engine = Engine(8, 8, start=(1, 1), rng=random.Random(seed), history=100)
+    path = str(tmp_path / 'rewound.snkr')
+    recorder = ReplayRecorder(path, seed, 100, 8, 8, 20, (1, 1))
+    state = engine.state
+    for i, action in enumerate(random_actions(seed, 300)):
+        if not state.alive or i % 40 == 39:
+            tick = state.ticks
+            recorder.rewind(tick, engine.rewind(10))
+            continue
+        if action is not None:
+            recorder.record(state.ticks, action)
+        engine.step(action)
+    recorder.close(state.ticks, len(state.snake))
+    recorder.wait(timeout=5)
+
+    replayed = simulate_replay(load_replay(path))
+    assert (list(replayed.snake), replayed.food, replayed.ticks) == (list(state.snake), state.food, state.ticks)
@@ -0,0 +1,83 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Snake
+from Snake import FixedTimestepScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeMaster:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append((delay, callback))
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def fire(self):
+        delay, callback = self.scheduled.pop()
+        callback()
+        return delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(Snake.time, 'perf_counter', clock)
+    return clock
+
+
+def test_runs_one_tick_per_interval_without_drift(clock):
+    master = FakeMaster()
+    ticks = []
+    scheduler = FixedTimestepScheduler(master, 100, lambda: ticks.append(clock.now))
+    scheduler.start()
+    assert len(ticks) == 1
+    for _ in range(9):
+        delay = master.scheduled[-1][0]
+        clock.now += delay / 1000 + 0.003
+        master.fire()
+        assert master.scheduled[-1][0] == 97
+    assert scheduler.ticks == 10
+    assert scheduler.skipped_ticks == 0
+
+
+def test_late_ticks_are_caught_up_then_skipped(clock):
+    master = FakeMaster()
+    scheduler = FixedTimestepScheduler(master, 125, lambda: None, max_catch_up=3)
+    scheduler.start()
+    clock.now += 1.0
+    master.fire()
+    assert scheduler.ticks == 1 + 3
+    assert scheduler.skipped_ticks == 5
+    assert scheduler.tick_rate() == pytest.approx(4 / 1.0)
+
+
+def test_stopping_inside_a_tick_ends_the_catch_up(clock):
+    master = FakeMaster()
+    scheduler = None
+
+    def tick():
+        if scheduler.ticks == 2:
+            scheduler.stop()
+
+    scheduler = FixedTimestepScheduler(master, 100, tick)
+    scheduler.start()
+    clock.now += 0.5
+    master.fire()
+    assert scheduler.ticks == 2
+    assert not master.scheduled
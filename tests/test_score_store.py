@@ -0,0 +1,48 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import ScoreStore
+
+
+def make_store(tmp_path, scores=(), difficulty='Normal'):
+    store = ScoreStore(str(tmp_path / 'scores.sqlite3'))
+    for i, score in enumerate(scores):
+        store.record(difficulty, f'player{i}', score, 10, float(i))
+    return store
+
+
+def test_top_is_ordered_by_score_then_age(tmp_path):
+    store = make_store(tmp_path, [5, 9, 7, 9])
+    assert [(row[2], row[3]) for row in store.top('Normal')] == [('player1', 9), ('player3', 9), ('player2', 7), ('player0', 5)]
+    assert store.top('Hard') == []
+
+
+def test_unnamed_games_stay_off_the_leaderboard(tmp_path):
+    store = make_store(tmp_path, [3])
+    store.record('Normal', '', 50, 10, 1.0)
+    assert [row[3] for row in store.top('Normal')] == [3]
+    assert len(list(store.rows())) == 2
+
+
+def test_qualifies_only_beats_the_last_place_once_full(tmp_path):
+    store = make_store(tmp_path, range(10, 20))
+    assert not store.qualifies('Normal', 10)
+    assert store.qualifies('Normal', 11)
+    assert store.qualifies('Normal', 1, limit=11)
+    assert store.qualifies('Hard', 0)
+
+
+def test_delete_removes_rows(tmp_path):
+    store = make_store(tmp_path, [1, 2, 3])
+    store.delete([row[0] for row in store.top('Normal')[:2]])
+    assert [row[3] for row in store.top('Normal')] == [1]
+
+
+def test_pages_walk_the_whole_leaderboard(tmp_path):
+    store = make_store(tmp_path, range(25))
+    pages = [store.page('Normal', offset, 10) for offset in range(0, store.count('Normal'), 10)]
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [row[3] for page in pages for row in page] == list(range(24, -1, -1))
+    assert store.page('Normal', 30, 10) == []
@@ -0,0 +1,62 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import FreeCells, PackedSnakeBody, SnakeBody
+
+COLUMNS, ROWS = 7, 5
+
+
+def board():
+    return FreeCells((x, y) for y in range(ROWS) for x in range(COLUMNS))
+
+
+def assert_same(packed, plain):
+    assert list(packed) == list(plain)
+    assert len(packed) == len(plain)
+    assert (packed.head, packed.tail) == (plain.head, plain.tail)
+    assert [packed[i] for i in range(-len(plain), len(plain))] == [plain[i] for i in range(-len(plain), len(plain))]
+    assert packed.occupied_count == plain.occupied_count
+    assert packed.head_collides() == plain.head_collides()
+    for y in range(ROWS):
+        for x in range(COLUMNS):
+            assert ((x, y) in packed) == ((x, y) in plain)
+    assert packed.free_cells.cells == plain.free_cells.cells
+
+
+def test_packed_body_matches_the_deque_body():
+    rng = random.Random(5)
+    start = [(3, 2), (2, 2), (1, 2)]
+    packed = PackedSnakeBody(COLUMNS, ROWS, start, free_cells=board(), capacity=2)
+    plain = SnakeBody(start, free_cells=board())
+    assert_same(packed, plain)
+    for _ in range(400):
+        move = rng.random()
+        if move < 0.45 or len(plain) < 2:
+            cell = (rng.randrange(COLUMNS), rng.randrange(ROWS))
+            assert packed.push_head(cell) == plain.push_head(cell)
+        elif move < 0.75:
+            assert packed.pop_tail() == plain.pop_tail()
+        elif move < 0.9:
+            cell = plain.tail
+            packed.append_tail(cell)
+            plain.append_tail(cell)
+        else:
+            assert packed.pop_tail() == plain.pop_tail()
+            cell = (rng.randrange(COLUMNS), rng.randrange(ROWS))
+            slot = plain.push_head(cell)
+            assert packed.push_head(cell) == slot
+            assert packed.pop_head(slot) == plain.pop_head(slot)
+        assert_same(packed, plain)
+
+
+def test_packed_body_grows_past_its_capacity():
+    packed = PackedSnakeBody(COLUMNS, ROWS, capacity=1)
+    cells = [(x, y) for y in range(ROWS) for x in range(COLUMNS)]
+    for cell in cells:
+        packed.push_head(cell)
+    assert list(packed) == cells[::-1]
+    assert packed.occupied_count == COLUMNS * ROWS
+    assert (COLUMNS, 0) not in packed and (-1, 0) not in packed
@@ -0,0 +1,39 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import DIRECTIONS, Engine, ReplayRecorder, replay_duration, verify_replay
+
+INTERVAL_MS = 100
+
+
+def record_game(path, seed):
+    engine = Engine(12, 12, start=(1, 1), rng=random.Random(seed))
+    recorder = ReplayRecorder(path, seed, INTERVAL_MS, 12, 12, 20, (1, 1))
+    moves = random.Random(seed + 1)
+    state = engine.state
+    while state.alive and state.ticks < 2000:
+        action = moves.choice(list(DIRECTIONS)) if moves.random() < 0.2 else None
+        if action is not None:
+            recorder.record(state.ticks, action)
+        engine.step(action)
+    recorder.close(state.ticks, len(state.snake))
+    recorder.wait(timeout=5)
+    return len(state.snake), replay_duration(state.ticks, INTERVAL_MS)
+
+
+def test_seeded_replay_reproduces_the_score(tmp_path):
+    for seed in range(5):
+        path = str(tmp_path / f'{seed}.snkr')
+        length, duration = record_game(path, seed)
+        assert verify_replay(path, length, duration, INTERVAL_MS) == ('ok', '')
+
+
+def test_a_changed_score_is_a_mismatch(tmp_path):
+    path = str(tmp_path / 'game.snkr')
+    length, duration = record_game(path, 9)
+    assert verify_replay(path, length + 1, duration, INTERVAL_MS)[0] == 'mismatch'
+    assert verify_replay(path, length, duration, INTERVAL_MS * 2)[0] == 'mismatch'
+    assert verify_replay(str(tmp_path / 'missing.snkr'), length, duration, INTERVAL_MS)[0] == 'missing'
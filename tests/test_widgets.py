@@ -0,0 +1,50 @@
+import os
+import sys
+import tkinter as tk
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Snake import CustomButton, CustomLabel, default_app_theme, theme_registry
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip('no display')
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+@pytest.fixture
+def headless_button(monkeypatch):
+    configured = {}
+    monkeypatch.setattr(tk.Button, '__init__', lambda self, master=None, **kwargs: None)
+    monkeypatch.setattr(tk.Button, 'configure', lambda self, **kwargs: configured.update(kwargs))
+    return configured
+
+
+def test_button_theme_options_is_static():
+    options = CustomButton.theme_options(default_app_theme)
+    assert options['background'] == default_app_theme['background_color']
+    assert options['activeforeground'] == default_app_theme['active_foreground']
+
+
+def test_construct_button_headless(headless_button):
+    button = CustomButton(text='Exit', app_theme=default_app_theme)
+    assert headless_button['foreground'] == default_app_theme['foreground_color']
+    assert button in theme_registry.widgets[CustomButton.theme_options]
+
+
+def test_construct_button(root):
+    button = CustomButton(root, text='Exit', app_theme=default_app_theme)
+    assert button.cget('background') == default_app_theme['background_color']
+    assert button.cget('activebackground') == default_app_theme['active_background']
+
+
+def test_labels_and_buttons_share_a_registry_entry():
+    assert CustomButton.theme_options is CustomLabel.theme_options
@@ -0,0 +1,226 @@
+import argparse
+import importlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Snake import DIRECTIONS, Engine, GameTheme, PathPlanner, default_game_theme, greedy_move
+
+DEFAULT_GAMES = 100
+DEFAULT_MAX_TICKS = 5000
+STALL_FACTOR = 2
+CHUNK_SIZE = 25
+
+
+def straight_policy(columns, rows, seed):
+    return lambda state: None
+
+
+def random_policy(columns, rows, seed, turn_probability=0.2):
+    rng = random.Random(seed)
+    directions = list(DIRECTIONS)
+
+    def policy(state):
+        return rng.choice(directions) if rng.random() < turn_probability else None
+    return policy
+
+
+def greedy_policy(columns, rows, seed):
+    def policy(state):
+        snake = state.snake
+
+        def is_free(cell):
+            return 0 <= cell[0] < columns and 0 <= cell[1] < rows and (cell not in snake or cell == snake.tail)
+        return greedy_move(snake.head, state.direction, state.food, is_free)
+    return policy
+
+
+def autopilot_policy(columns, rows, seed):
+    planner = PathPlanner(columns, rows)
+    return lambda state: planner.decide(tuple(state.snake), state.food, float('inf'))
+
+
+POLICIES = {
+    'straight': straight_policy,
+    'random': random_policy,
+    'greedy': greedy_policy,
+    'autopilot': autopilot_policy,
+}
+
+
+def resolve_policy(name):
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _, attribute = name.partition(':')
+    if not attribute:
+        raise ValueError(f'unknown policy {name!r}; use one of {", ".join(POLICIES)} or module:callable')
+    return getattr(importlib.import_module(module), attribute)
+
+
+def play_game(policy_name, seed, columns, rows, start, max_ticks, stall_ticks):
+    engine = Engine(columns, rows, start=start, rng=random.Random(seed))
+    policy = resolve_policy(policy_name)(columns, rows, seed)
+    state = engine.state
+    last_meal = 0
+    while state.alive and state.ticks < max_ticks and state.ticks - last_meal < stall_ticks:
+        if engine.step(policy(state)):
+            last_meal = state.ticks
+    return len(state.snake), state.ticks, state.won, state.alive
+
+
+def play_games(policy_name, seeds, columns, rows, start, max_ticks, stall_ticks):
+    return [play_game(policy_name, seed, columns, rows, start, max_ticks, stall_ticks) for seed in seeds]
+
+
+def percentile(ordered, percent):
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+class Report:
+    def __init__(self, policy):
+        self.policy = policy
+        self.lengths = []
+        self.ticks = []
+        self.wins = 0
+        self.cut = 0
+
+    def add(self, results):
+        for length, ticks, won, alive in results:
+            self.lengths.append(length)
+            self.ticks.append(ticks)
+            self.wins += won
+            self.cut += alive
+
+    def summary(self):
+        lengths = sorted(self.lengths)
+        ticks = sorted(self.ticks)
+        games = len(lengths)
+        return {
+            'policy': self.policy,
+            'games': games,
+            'wins': self.wins,
+            'cut': self.cut,
+            'mean_length': sum(lengths) / games if games else 0,
+            'length_p50': percentile(lengths, 50),
+            'length_p90': percentile(lengths, 90),
+            'length_p99': percentile(lengths, 99),
+            'mean_ticks': sum(ticks) / games if games else 0,
+            'ticks_p50': percentile(ticks, 50),
+            'ticks_p90': percentile(ticks, 90),
+            'ticks_p99': percentile(ticks, 99),
+        }
+
+
+def run_tournament(policies, games, columns, rows, start, max_ticks, stall_ticks, workers=None, seed_base=0, progress=None):
+    reports = {policy: Report(policy) for policy in policies}
+    seeds = range(seed_base, seed_base + games)
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, games, CHUNK_SIZE)]
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(play_games, policy, chunk, columns, rows, start, max_ticks, stall_ticks): policy
+                   for policy in policies for chunk in chunks}
+        done = 0
+        for future in as_completed(futures):
+            reports[futures[future]].add(future.result())
+            done += 1
+            if progress:
+                progress(done, len(futures))
+    elapsed = time.perf_counter() - started
+    return [report.summary() for report in reports.values()], elapsed
+
+
+def format_report(summaries, elapsed):
+    lines = [f'{"policy":<12}{"games":>7}{"wins":>6}{"cut":>6}{"mean len":>10}{"p50":>6}{"p90":>6}{"p99":>6}'
+             f'{"mean ticks":>12}{"p50":>8}{"p90":>8}{"p99":>8}']
+    total = 0
+    for s in summaries:
+        total += s['games']
+        lines.append(f'{s["policy"]:<12}{s["games"]:>7}{s["wins"]:>6}{s["cut"]:>6}{s["mean_length"]:>10.1f}{s["length_p50"]:>6}'
+                     f'{s["length_p90"]:>6}{s["length_p99"]:>6}{s["mean_ticks"]:>12.1f}{s["ticks_p50"]:>8}'
+                     f'{s["ticks_p90"]:>8}{s["ticks_p99"]:>8}')
+    lines.append(f'{total} games in {elapsed:.1f} s ({total / elapsed:,.2f} games/s)')
+    return '\n'.join(lines)
+
+
+def worker_counts(maximum):
+    counts = []
+    workers = 1
+    while workers < maximum:
+        counts.append(workers)
+        workers *= 2
+    counts.append(maximum)
+    return counts
+
+
+def run_scaling(policies, games, columns, rows, start, max_ticks, stall_ticks, seed_base=0):
+    rows_out = []
+    baseline = None
+    for workers in worker_counts(os.cpu_count() or 1):
+        _, elapsed = run_tournament(policies, games, columns, rows, start, max_ticks, stall_ticks, workers, seed_base)
+        rate = games * len(policies) / elapsed
+        baseline = baseline or rate
+        rows_out.append({'workers': workers, 'games_per_second': rate,
+                         'speedup': rate / baseline, 'efficiency': rate / baseline / workers})
+    return rows_out
+
+
+def format_scaling(scaling):
+    lines = [f'{"workers":>8}{"games/s":>12}{"speedup":>9}{"efficiency":>12}']
+    for row in scaling:
+        lines.append(f'{row["workers"]:>8}{row["games_per_second"]:>12,.2f}{row["speedup"]:>8.2f}x{row["efficiency"]:>11.0%}')
+    return '\n'.join(lines)
+
+
+def main():
+    theme = GameTheme(default_game_theme)
+    parser = argparse.ArgumentParser(description='Play snake policies against each other over many seeded games.')
+    parser.add_argument('--policy', action='append', dest='policies',
+                        help=f'policy to evaluate ({", ".join(POLICIES)} or module:callable); repeat for several')
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES, help='games per policy')
+    parser.add_argument('--seed-base', type=int, default=0, help='first seed; game i uses seed-base + i')
+    parser.add_argument('--columns', type=int, default=theme.columns)
+    parser.add_argument('--rows', type=int, default=theme.rows)
+    parser.add_argument('--max-ticks', type=int, default=DEFAULT_MAX_TICKS, help='stop a game that survives this long')
+    parser.add_argument('--stall-ticks', type=int,
+                        help=f'stop a game after this many ticks without eating (default: {STALL_FACTOR} x board cells)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: every core)')
+    parser.add_argument('--scaling', action='store_true', help='rerun with 1, 2, 4, ... workers and report the speedup')
+    parser.add_argument('--output', help='write the report as JSON')
+    args = parser.parse_args()
+
+    policies = args.policies or ['greedy', 'autopilot']
+    for policy in policies:
+        try:
+            resolve_policy(policy)
+        except (ValueError, ImportError, AttributeError) as error:
+            parser.error(str(error))
+    start = theme.start
+    stall_ticks = args.stall_ticks or STALL_FACTOR * args.columns * args.rows
+
+    def progress(done, total):
+        print(f'\r{done}/{total} batches', end='', flush=True)
+
+    summaries, elapsed = run_tournament(policies, args.games, args.columns, args.rows, start, args.max_ticks,
+                                        stall_ticks, args.workers, args.seed_base, progress)
+    print()
+    print(format_report(summaries, elapsed))
+    report = {'columns': args.columns, 'rows': args.rows, 'max_ticks': args.max_ticks, 'stall_ticks': stall_ticks,
+              'seed_base': args.seed_base, 'elapsed': elapsed, 'policies': summaries}
+
+    if args.scaling:
+        scaling = run_scaling(policies, args.games, args.columns, args.rows, start, args.max_ticks, stall_ticks, args.seed_base)
+        print()
+        print(format_scaling(scaling))
+        report['scaling'] = scaling
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=4)
+
+
+if __name__ == '__main__':
+    main()